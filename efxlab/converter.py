@@ -5,9 +5,14 @@ Handles direct and inverse pair lookups with proper bid/ask spreads.
 """
 
 from decimal import Decimal
+from typing import Dict, Final, Mapping
 
 from efxlab.state import EngineState, MarketRate
 
+_ZERO: Final[Decimal] = Decimal("0")
+# Rate of a currency against itself
+_ONE: Final[Decimal] = Decimal("1")
+
 
 class ConversionError(Exception):
     """Raised when currency conversion is not possible."""
@@ -23,10 +28,60 @@ class CurrencyConverter:
     - Direct pairs (EUR/USD for EUR->USD)
     - Inverse pairs (EUR/USD for USD->EUR)
     - Bid/ask spreads
+
+    All arithmetic stays in Decimal: conversions feed reported equity and
+    lot prices, which must be exact and byte-identical across runs.
     """
 
     def __init__(self, state: EngineState):
-        self.state = state
+        # Only market data and reporting currency are read, so a converter stays
+        # valid for every state derived without a rate or config change
+        self.rate_index = state.rate_index
+        self.reporting_currency = state.reporting_currency
+        # {currency: quote against reporting currency}, filled on first use
+        self._reporting_quotes: Dict[str, tuple[MarketRate, bool] | None] = {}
+        # Last mapping summed and its total; books are copied on write, so an
+        # identical mapping object means identical balances
+        self._last_summed: Mapping[str, Decimal] | None = None
+        self._last_total = _ZERO
+
+    def _lookup(self, from_currency: str, to_currency: str) -> tuple[MarketRate, bool] | None:
+        """
+        Find the rate quoting from_currency against to_currency.
+
+        Returns:
+            (rate, is_inverse) where is_inverse is True when the rate was found
+            on the to/from pair, or None if neither pair is quoted
+        """
+        quotes = self.rate_index.get(from_currency)
+        if quotes is None:
+            return None
+        return quotes.get(to_currency)
+
+    def _apply(
+        self,
+        amount: Decimal,
+        found: tuple[MarketRate, bool] | None,
+        from_currency: str,
+        to_currency: str,
+        use_mid: bool,
+    ) -> Decimal:
+        """Convert amount through a looked-up quote."""
+        if found is None:
+            raise ConversionError(
+                f"No market rate available for {from_currency}/{to_currency} "
+                f"or {to_currency}/{from_currency}"
+            )
+
+        rate, is_inverse = found
+        if not is_inverse:
+            price = rate.mid if use_mid else (rate.bid if amount > 0 else rate.ask)
+            return amount * price
+
+        price = rate.mid if use_mid else (rate.ask if amount > 0 else rate.bid)
+        if price == 0:
+            raise ConversionError(f"Cannot divide by zero rate for {to_currency}/{from_currency}")
+        return amount / price
 
     def convert(
         self, amount: Decimal, from_currency: str, to_currency: str, use_mid: bool = True
@@ -48,48 +103,80 @@ class CurrencyConverter:
         """
         if from_currency == to_currency:
             return amount
-
-        # Try direct pair
-        direct_pair = f"{from_currency}/{to_currency}"
-        rate = self.state.get_market_rate(direct_pair)
-        if rate:
-            price = rate.mid if use_mid else (rate.bid if amount > 0 else rate.ask)
-            return amount * price
-
-        # Try inverse pair
-        inverse_pair = f"{to_currency}/{from_currency}"
-        rate = self.state.get_market_rate(inverse_pair)
-        if rate:
-            price = rate.mid if use_mid else (rate.ask if amount > 0 else rate.bid)
-            if price == 0:
-                raise ConversionError(f"Cannot divide by zero rate for {inverse_pair}")
-            return amount / price
-
-        # No rate available
-        raise ConversionError(
-            f"No market rate available for {from_currency}/{to_currency} "
-            f"or {to_currency}/{from_currency}"
-        )
+        found = self._lookup(from_currency, to_currency)
+        return self._apply(amount, found, from_currency, to_currency, use_mid)
+
+    def _reporting_quote(self, currency: str) -> tuple[MarketRate, bool] | None:
+        """Quote of currency against the reporting currency, memoized per converter."""
+        try:
+            return self._reporting_quotes[currency]
+        except KeyError:
+            found = self._lookup(currency, self.reporting_currency)
+            self._reporting_quotes[currency] = found
+            return found
 
     def convert_to_reporting(self, amount: Decimal, currency: str) -> Decimal:
         """Convert amount to reporting currency."""
-        return self.convert(amount, currency, self.state.reporting_currency)
+        reporting_currency = self.reporting_currency
+        if currency == reporting_currency:
+            return amount
+        found = self._reporting_quote(currency)
+        return self._apply(amount, found, currency, reporting_currency, True)
+
+    def sum_to_reporting(self, amounts: Mapping[str, Decimal]) -> Decimal:
+        """
+        Sum amounts held in several currencies in the reporting currency.
+
+        Currencies with no available rate are skipped. Summing the same mapping
+        object again returns the cached total, so callers must not mutate it in
+        place between calls (state books never are).
+
+        Args:
+            amounts: {currency: amount}
+
+        Returns:
+            Total in reporting currency
+        """
+        if amounts is self._last_summed:
+            return self._last_total
+
+        reporting_quote = self._reporting_quote
+        reporting_currency = self.reporting_currency
+        total = _ZERO
+        for currency, amount in amounts.items():
+            if currency == reporting_currency:
+                # Usually the bulk of the book; skip the rate lookup
+                total += amount
+                continue
+
+            # Same mid-rate arithmetic as convert_to_reporting, minus the
+            # exception path for unconvertible currencies
+            found = reporting_quote(currency)
+            if found is None:
+                continue
+            rate, is_inverse = found
+            if not is_inverse:
+                total += amount * rate.mid
+            elif rate.mid != 0:
+                total += amount / rate.mid
+
+        self._last_summed = amounts
+        self._last_total = total
+        return total
 
     def get_rate(self, from_currency: str, to_currency: str) -> Decimal:
         """Get mid rate between two currencies."""
         if from_currency == to_currency:
-            return Decimal("1")
+            return _ONE
 
-        direct_pair = f"{from_currency}/{to_currency}"
-        rate = self.state.get_market_rate(direct_pair)
-        if rate:
-            return rate.mid
+        found = self._lookup(from_currency, to_currency)
+        if found is None:
+            raise ConversionError(f"No market rate available for {from_currency}/{to_currency}")
 
-        inverse_pair = f"{to_currency}/{from_currency}"
-        rate = self.state.get_market_rate(inverse_pair)
-        if rate:
-            if rate.mid == 0:
-                raise ConversionError(f"Cannot divide by zero rate for {inverse_pair}")
-            return Decimal("1") / rate.mid
+        rate, is_inverse = found
+        if not is_inverse:
+            return rate.mid
 
-        raise ConversionError(f"No market rate available for {from_currency}/{to_currency}")
+        if rate.mid == 0:
+            raise ConversionError(f"Cannot divide by zero rate for {to_currency}/{from_currency}")
+        return rate.inverse_mid
@@ -2,17 +2,46 @@
 Trade decomposition logic for converting crosses into direct risk pairs.
 """
 
+import sys
 from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Optional
+from functools import lru_cache
+from typing import List, Optional, Tuple
 
 from efxlab.converter import CurrencyConverter
-from efxlab.events import Side
+from efxlab.events import Side, split_pair
 from efxlab.lot import Lot
 
+# (base, quote, base_risk_pair, quote_risk_pair, base_path, quote_path)
+CrossRoute = Tuple[str, str, str, str, str, str]
 
-@dataclass
+
+@lru_cache(maxsize=256)
+def _cross_route(trade_pair: str, reporting_currency: str) -> CrossRoute | None:
+    """
+    Risk pairs and decomposition paths for a trade pair, built once per pair.
+
+    Returns None for direct pairs (quoted in the reporting currency). Strings
+    are interned, as Lot would intern them anyway; raises ValueError if the
+    pair is malformed.
+    """
+    base, quote = split_pair(trade_pair)
+    if quote == reporting_currency:
+        return None
+    base_risk_pair = sys.intern(f"{base}/{reporting_currency}")
+    quote_risk_pair = sys.intern(f"{quote}/{reporting_currency}")
+    return (
+        base,
+        quote,
+        base_risk_pair,
+        quote_risk_pair,
+        sys.intern(f"{trade_pair}->{base_risk_pair}"),
+        sys.intern(f"{trade_pair}->{quote_risk_pair}"),
+    )
+
+
+@dataclass(slots=True)
 class DecomposedLeg:
     """
     A single leg from decomposing a cross trade.
@@ -72,11 +101,12 @@ class TradeDecomposer:
         Raises:
             ValueError: If decomposition cannot be performed
         """
-        base, quote = trade_pair.split("/")
+        route = _cross_route(trade_pair, self.reporting_currency)
 
         # If trade is already a direct pair, return single leg
-        if quote == self.reporting_currency:
+        if route is None:
             return [self._direct_pair_leg(trade_pair, client_side, quantity, execution_price)]
+        base, quote, base_risk_pair, quote_risk_pair, base_path, quote_path = route
 
         # Cross trade: decompose into two legs
         # Client BUY EUR/GBP means:
@@ -84,10 +114,9 @@ class TradeDecomposer:
         # - Desk BUYS GBP (pays reporting currency)
 
         # Desk's side is opposite of client's side
-        desk_side_base = Side.SELL if client_side == Side.BUY else Side.BUY
+        desk_side_base = client_side.opposite
 
         # Leg 1: Base currency risk pair
-        base_risk_pair = f"{base}/{self.reporting_currency}"
         try:
             base_rate = self.converter.get_rate(base, self.reporting_currency)
         except ValueError as e:
@@ -98,16 +127,15 @@ class TradeDecomposer:
             side=desk_side_base,
             quantity=quantity,
             trade_price=base_rate,
-            decomposition_path=f"{trade_pair}->{base_risk_pair}",
+            decomposition_path=base_path,
         )
 
         # Leg 2: Quote currency risk pair
         # Amount in quote currency = quantity * execution_price
         quote_amount = quantity * execution_price
-        quote_risk_pair = f"{quote}/{self.reporting_currency}"
 
         # Desk's side for quote is opposite of base
-        desk_side_quote = Side.BUY if desk_side_base == Side.SELL else Side.SELL
+        desk_side_quote = desk_side_base.opposite
 
         try:
             quote_rate = self.converter.get_rate(quote, self.reporting_currency)
@@ -119,7 +147,7 @@ class TradeDecomposer:
             side=desk_side_quote,
             quantity=quote_amount,
             trade_price=quote_rate,
-            decomposition_path=f"{trade_pair}->{quote_risk_pair}",
+            decomposition_path=quote_path,
         )
 
         return [leg1, leg2]
@@ -133,7 +161,7 @@ class TradeDecomposer:
     ) -> DecomposedLeg:
         """Create leg for direct pair (no decomposition needed)."""
         # Desk's side is opposite of client's side
-        desk_side = Side.SELL if client_side == Side.BUY else Side.BUY
+        desk_side = client_side.opposite
 
         return DecomposedLeg(
             risk_pair=risk_pair,
@@ -143,6 +171,43 @@ class TradeDecomposer:
             decomposition_path=risk_pair,  # No decomposition for direct pairs
         )
 
+    def leg_to_lot(
+        self,
+        leg: DecomposedLeg,
+        originating_trade_id: str,
+        timestamp: datetime,
+        open_mid: Decimal,
+        quantity: Decimal | None = None,
+    ) -> Lot:
+        """
+        Convert a single decomposed leg into a Lot.
+
+        Args:
+            leg: Decomposed leg
+            originating_trade_id: ID of the original client trade
+            timestamp: Trade timestamp
+            open_mid: Current mid price for the leg's risk pair
+            quantity: Lot quantity if not the full leg (e.g., unmatched remainder)
+
+        Returns:
+            Lot ready to add to its lot queue
+        """
+        if quantity is None:
+            quantity = leg.quantity
+        # Positional Lot fields, in declaration order; close fields stay at their defaults
+        return Lot(
+            f"{originating_trade_id}_{leg.risk_pair}",
+            leg.risk_pair,
+            leg.side,
+            quantity,
+            quantity,
+            leg.trade_price,
+            timestamp,
+            originating_trade_id,
+            leg.decomposition_path,
+            open_mid,
+        )
+
     def legs_to_lots(
         self,
         legs: List[DecomposedLeg],
@@ -162,26 +227,12 @@ class TradeDecomposer:
         Returns:
             List of Lot objects ready to add to lot queues
         """
-        lots = []
         for leg in legs:
-            open_mid = open_mids.get(leg.risk_pair)
-            if open_mid is None:
+            if leg.risk_pair not in open_mids:
                 raise ValueError(f"Missing mid price for {leg.risk_pair} needed to create lot")
 
-            lot = Lot(
-                lot_id=f"{originating_trade_id}_{leg.risk_pair}",
-                risk_pair=leg.risk_pair,
-                side=leg.side,
-                quantity=leg.quantity,
-                original_quantity=leg.quantity,
-                trade_price=leg.trade_price,
-                open_timestamp=timestamp,
-                originating_trade_id=originating_trade_id,
-                decomposition_path=leg.decomposition_path,
-                open_mid=open_mid,
-                close_timestamp=None,
-                close_mid=None,
-            )
-            lots.append(lot)
-
-        return lots
+        leg_to_lot = self.leg_to_lot
+        return [
+            leg_to_lot(leg, originating_trade_id, timestamp, open_mids[leg.risk_pair])
+            for leg in legs
+        ]
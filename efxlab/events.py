@@ -4,11 +4,18 @@ Event schema definitions for the simulation engine.
 All events are immutable and must be deterministically ordered.
 """
 
+import os
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime
 from decimal import Decimal
 from enum import Enum
-from typing import Any
+from functools import lru_cache
+from typing import Any, Tuple
+
+# Field validation in __post_init__; set EFXLAB_SKIP_VALIDATION for trusted feeds.
+# Derived fields are always populated.
+VALIDATE_EVENTS = not os.environ.get("EFXLAB_SKIP_VALIDATION")
 
 
 class EventType(Enum):
@@ -28,47 +35,81 @@ class Side(Enum):
     BUY = "BUY"
     SELL = "SELL"
 
+    # The other side, bound to each member below so flipping is an attribute read
+    opposite: "Side"
+
+
+Side.BUY.opposite = Side.SELL
+Side.SELL.opposite = Side.BUY
+
+
+@lru_cache(maxsize=256)
+def split_pair(currency_pair: str) -> Tuple[str, str]:
+    """
+    Split "BASE/QUOTE" into interned (base, quote) currency codes.
+
+    Cached per distinct pair; raises ValueError if the pair is malformed.
+    """
+    base_ccy, quote_ccy = currency_pair.split("/")
+    return sys.intern(base_ccy), sys.intern(quote_ccy)
+
+
+def _set_pair_currencies(event: Any) -> None:
+    """Intern a frozen event's currency_pair and set its base_ccy/quote_ccy fields."""
+    currency_pair = sys.intern(event.currency_pair)
+    base_ccy, quote_ccy = split_pair(currency_pair)
+    object.__setattr__(event, "currency_pair", currency_pair)
+    object.__setattr__(event, "base_ccy", base_ccy)
+    object.__setattr__(event, "quote_ccy", quote_ccy)
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BaseEvent:
     """
     Base event with fields required for deterministic ordering.
 
     Events are ordered by (timestamp, sequence_id). The sequence_id ensures
     stable ordering when multiple events share the same timestamp.
+
+    Events are slotted; subclasses call BaseEvent.__post_init__(self) directly
+    because zero-argument super() does not work in slotted dataclasses.
     """
 
     timestamp: datetime
     sequence_id: int
     event_type: EventType
 
+    # (timestamp, sequence_id), built once so sorting compares a single tuple
+    _sort_key: Tuple[datetime, int] = field(init=False, repr=False, compare=False)
+
     def __post_init__(self) -> None:
-        if self.sequence_id < 0:
+        if VALIDATE_EVENTS and self.sequence_id < 0:
             raise ValueError(f"sequence_id must be non-negative, got {self.sequence_id}")
+        object.__setattr__(self, "_sort_key", (self.timestamp, self.sequence_id))
 
     def __lt__(self, other: Any) -> bool:
         """Compare events for sorting by timestamp and sequence_id."""
         if not isinstance(other, BaseEvent):
             return NotImplemented
-        return (self.timestamp, self.sequence_id) < (other.timestamp, other.sequence_id)
+        return self._sort_key < other._sort_key
 
     def __le__(self, other: Any) -> bool:
         if not isinstance(other, BaseEvent):
             return NotImplemented
-        return (self.timestamp, self.sequence_id) <= (other.timestamp, other.sequence_id)
+        return self._sort_key <= other._sort_key
 
     def __gt__(self, other: Any) -> bool:
         if not isinstance(other, BaseEvent):
             return NotImplemented
-        return (self.timestamp, self.sequence_id) > (other.timestamp, other.sequence_id)
+        return self._sort_key > other._sort_key
 
     def __ge__(self, other: Any) -> bool:
         if not isinstance(other, BaseEvent):
             return NotImplemented
-        return (self.timestamp, self.sequence_id) >= (other.timestamp, other.sequence_id)
+        return self._sort_key >= other._sort_key
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ClientTradeEvent(BaseEvent):
     """
     Client trade execution event.
@@ -90,17 +131,26 @@ class ClientTradeEvent(BaseEvent):
     client_id: str
     trade_id: str
 
-    def __post_init__(self) -> None:
-        super().__post_init__()
-        if self.notional <= 0:
-            raise ValueError(f"notional must be positive, got {self.notional}")
-        if self.price <= 0:
-            raise ValueError(f"price must be positive, got {self.price}")
-        if "/" not in self.currency_pair:
-            raise ValueError(f"currency_pair must contain '/', got {self.currency_pair}")
+    # Derived from currency_pair once at construction
+    base_ccy: str = field(init=False, repr=False, compare=False)
+    quote_ccy: str = field(init=False, repr=False, compare=False)
+    # notional * price, shared by the cash update and the trade record
+    quote_amount: Decimal = field(init=False, repr=False, compare=False)
 
-
-@dataclass(frozen=True)
+    def __post_init__(self) -> None:
+        BaseEvent.__post_init__(self)
+        if VALIDATE_EVENTS:
+            if self.notional <= 0:
+                raise ValueError(f"notional must be positive, got {self.notional}")
+            if self.price <= 0:
+                raise ValueError(f"price must be positive, got {self.price}")
+            if "/" not in self.currency_pair:
+                raise ValueError(f"currency_pair must contain '/', got {self.currency_pair}")
+        _set_pair_currencies(self)
+        object.__setattr__(self, "quote_amount", self.notional * self.price)
+
+
+@dataclass(frozen=True, slots=True)
 class MarketUpdateEvent(BaseEvent):
     """
     Market data update event.
@@ -117,16 +167,19 @@ class MarketUpdateEvent(BaseEvent):
     mid: Decimal  # Mid price for reporting
 
     def __post_init__(self) -> None:
-        super().__post_init__()
-        if self.bid <= 0 or self.ask <= 0 or self.mid <= 0:
-            raise ValueError("All prices must be positive")
-        if self.bid >= self.ask:
-            raise ValueError(f"bid {self.bid} must be < ask {self.ask}")
-        if not (self.bid <= self.mid <= self.ask):
-            raise ValueError(f"mid {self.mid} must be between bid {self.bid} and ask {self.ask}")
-
-
-@dataclass(frozen=True)
+        BaseEvent.__post_init__(self)
+        if VALIDATE_EVENTS:
+            if self.bid <= 0 or self.ask <= 0 or self.mid <= 0:
+                raise ValueError("All prices must be positive")
+            if self.bid >= self.ask:
+                raise ValueError(f"bid {self.bid} must be < ask {self.ask}")
+            if not (self.bid <= self.mid <= self.ask):
+                raise ValueError(
+                    f"mid {self.mid} must be between bid {self.bid} and ask {self.ask}"
+                )
+
+
+@dataclass(frozen=True, slots=True)
 class ConfigUpdateEvent(BaseEvent):
     """
     Configuration change event.
@@ -139,12 +192,12 @@ class ConfigUpdateEvent(BaseEvent):
     config_value: Any
 
     def __post_init__(self) -> None:
-        super().__post_init__()
-        if not self.config_key:
+        BaseEvent.__post_init__(self)
+        if VALIDATE_EVENTS and not self.config_key:
             raise ValueError("config_key cannot be empty")
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class HedgeOrderEvent(BaseEvent):
     """
     Hedge order placement event.
@@ -160,14 +213,15 @@ class HedgeOrderEvent(BaseEvent):
     limit_price: Decimal | None  # None for market orders
 
     def __post_init__(self) -> None:
-        super().__post_init__()
-        if self.notional <= 0:
-            raise ValueError(f"notional must be positive, got {self.notional}")
-        if self.limit_price is not None and self.limit_price <= 0:
-            raise ValueError(f"limit_price must be positive, got {self.limit_price}")
+        BaseEvent.__post_init__(self)
+        if VALIDATE_EVENTS:
+            if self.notional <= 0:
+                raise ValueError(f"notional must be positive, got {self.notional}")
+            if self.limit_price is not None and self.limit_price <= 0:
+                raise ValueError(f"limit_price must be positive, got {self.limit_price}")
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class HedgeFillEvent(BaseEvent):
     """
     Hedge execution event.
@@ -183,15 +237,28 @@ class HedgeFillEvent(BaseEvent):
     fill_price: Decimal
     slippage: Decimal = Decimal("0")  # Slippage cost in quote ccy
 
-    def __post_init__(self) -> None:
-        super().__post_init__()
-        if self.notional <= 0:
-            raise ValueError(f"notional must be positive, got {self.notional}")
-        if self.fill_price <= 0:
-            raise ValueError(f"fill_price must be positive, got {self.fill_price}")
+    # Derived from currency_pair once at construction
+    base_ccy: str = field(init=False, repr=False, compare=False)
+    quote_ccy: str = field(init=False, repr=False, compare=False)
+    # Quote cash delta for the slippage, or None when there is none to apply
+    slippage_cash_delta: Decimal | None = field(init=False, repr=False, compare=False)
 
-
-@dataclass(frozen=True)
+    def __post_init__(self) -> None:
+        BaseEvent.__post_init__(self)
+        if VALIDATE_EVENTS:
+            if self.notional <= 0:
+                raise ValueError(f"notional must be positive, got {self.notional}")
+            if self.fill_price <= 0:
+                raise ValueError(f"fill_price must be positive, got {self.fill_price}")
+            if "/" not in self.currency_pair:
+                raise ValueError(f"currency_pair must contain '/', got {self.currency_pair}")
+        _set_pair_currencies(self)
+        object.__setattr__(
+            self, "slippage_cash_delta", -self.slippage if self.slippage != 0 else None
+        )
+
+
+@dataclass(frozen=True, slots=True)
 class ClockTickEvent(BaseEvent):
     """
     Periodic clock tick for snapshots and metric calculation.
@@ -206,6 +273,6 @@ class ClockTickEvent(BaseEvent):
     tick_label: str  # e.g., "EOD", "HOURLY", "T+5min"
 
     def __post_init__(self) -> None:
-        super().__post_init__()
-        if not self.tick_label:
+        BaseEvent.__post_init__(self)
+        if VALIDATE_EVENTS and not self.tick_label:
             raise ValueError("tick_label cannot be empty")
@@ -4,12 +4,12 @@ Event handlers - pure functions that transform state.
 Each handler takes (State, Event) and returns (State, OutputRecords).
 """
 
-from dataclasses import dataclass, replace
+from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal
-from typing import Any, Dict, List
+from enum import Enum
+from typing import Any, Dict, Final, List
 
-from efxlab.converter import CurrencyConverter
 from efxlab.decomposition import TradeDecomposer
 from efxlab.events import (
     ClientTradeEvent,
@@ -20,17 +20,41 @@ from efxlab.events import (
     MarketUpdateEvent,
     Side,
 )
-from efxlab.state import EngineState, apply_trade
+from efxlab.state import DecimalStrCache, EngineState, apply_trade
 
+_ZERO: Final[Decimal] = Decimal("0")
 
-@dataclass
+
+def _render_value(value: Any) -> Any:
+    """Render a raw output value the way sinks write it (Decimals and enums as strings)."""
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, dict):
+        return {key: _render_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_render_value(item) for item in value]
+    return value
+
+
+@dataclass(slots=True)
 class OutputRecord:
-    """Generic output record for logging."""
+    """
+    Generic output record for logging.
+
+    Handlers store raw values (Decimal, Side) in ``data``; sinks render them
+    to strings through rendered_data() only when a record is written.
+    """
 
     timestamp: datetime
     record_type: str
     data: Dict[str, Any]
 
+    def rendered_data(self) -> Dict[str, Any]:
+        """Record fields as written to outputs (Decimals and enums as strings)."""
+        return {key: _render_value(value) for key, value in self.data.items()}
+
 
 def handle_client_trade(
     state: EngineState, event: ClientTradeEvent
@@ -54,13 +78,12 @@ def handle_client_trade(
         event.side,
         event.notional,
         event.price,
+        event.quote_amount,
+        timestamp=event.timestamp,
+        currencies=(event.base_ccy, event.quote_ccy),
     )
-    new_state = new_state.increment_event_count(event.timestamp.isoformat())
 
     # Base output record
-    base_ccy, quote_ccy = event.currency_pair.split("/")
-    quote_amount = event.notional * event.price
-
     outputs: List[OutputRecord] = []
 
     trade_output = OutputRecord(
@@ -70,12 +93,12 @@ def handle_client_trade(
             "trade_id": event.trade_id,
             "client_id": event.client_id,
             "currency_pair": event.currency_pair,
-            "side": event.side.value,
-            "notional": str(event.notional),
-            "price": str(event.price),
-            "quote_amount": str(quote_amount),
-            "base_currency": base_ccy,
-            "quote_currency": quote_ccy,
+            "side": event.side,
+            "notional": event.notional,
+            "price": event.price,
+            "quote_amount": event.quote_amount,
+            "base_currency": event.base_ccy,
+            "quote_currency": event.quote_ccy,
         },
     )
     outputs.append(trade_output)
@@ -106,8 +129,7 @@ def _handle_lot_tracking(state: EngineState, event: ClientTradeEvent) -> List[Ou
         return outputs
 
     # Decompose trade into risk pair legs
-    converter = CurrencyConverter(state)
-    decomposer = TradeDecomposer(converter, state.reporting_currency)
+    decomposer = TradeDecomposer(state.converter, state.reporting_currency)
 
     try:
         legs = decomposer.decompose(
@@ -131,12 +153,12 @@ def _handle_lot_tracking(state: EngineState, event: ClientTradeEvent) -> List[Ou
         )
         return outputs
 
-    # Get current mid prices for lot creation
-    open_mids = {}
+    # Get current mid prices for lot creation, aligned with legs
+    open_mids: List[Decimal] = []
     for leg in legs:
         rate = state.get_market_rate(leg.risk_pair)
         if rate:
-            open_mids[leg.risk_pair] = rate.mid
+            open_mids.append(rate.mid)
         else:
             # Missing market rate, can't create lot
             outputs.append(
@@ -152,45 +174,48 @@ def _handle_lot_tracking(state: EngineState, event: ClientTradeEvent) -> List[Ou
             )
             return outputs
 
+    # Per-trade invariants, bound once for all legs
+    lot_manager = state.lot_manager
+    leg_to_lot = decomposer.leg_to_lot
+    trade_id = event.trade_id
+    timestamp = event.timestamp
+
     # Process each leg
-    for leg in legs:
+    for leg, open_mid in zip(legs, open_mids):
         # Get current net position before this leg
-        current_net = state.lot_manager.get_net_position(leg.risk_pair)
-
-        # Determine if this leg increases or decreases net position
-        leg_impact = leg.quantity if leg.side == Side.BUY else -leg.quantity
-        new_net = current_net + leg_impact
+        current_net = lot_manager.get_net_position(leg.risk_pair)
 
-        # Check if leg reduces position (opposite sign or moves toward zero)
-        reduces_position = (current_net > 0 and leg_impact < 0) or (  # Long position, selling
-            current_net < 0 and leg_impact > 0
-        )  # Short position, buying
+        # Leg reduces position when it trades against an open net position:
+        # selling into a long or buying into a short (leg quantity is positive)
+        reduces_position = current_net != 0 and (current_net > 0) is (leg.side is Side.SELL)
 
         if reduces_position:
             # Match against existing lots (internalization)
             # Pass the leg's side directly - match_lots will find opposite lots
-            matches = state.lot_manager.match_lots(
+            matches = lot_manager.match_lots(
                 leg.risk_pair,
                 leg.quantity,
                 leg.side,  # Pass leg side directly
                 leg.trade_price,
-                event.timestamp,
+                timestamp,
             )
 
-            # Create output records for matches
+            # Create output records for matches, totalling matched quantity as we go
+            matched_total = _ZERO
             for match in matches:
+                matched_total += match.matched_quantity
                 outputs.append(
                     OutputRecord(
-                        timestamp=event.timestamp,
+                        timestamp=timestamp,
                         record_type="lot_match",
                         data={
-                            "trade_id": event.trade_id,
+                            "trade_id": trade_id,
                             "lot_id": match.lot.lot_id,
                             "risk_pair": leg.risk_pair,
-                            "matched_quantity": str(match.matched_quantity),
-                            "realized_pnl": str(match.realized_pnl),
-                            "close_price": str(match.close_price),
-                            "original_lot_side": match.lot.side.value,
+                            "matched_quantity": match.matched_quantity,
+                            "realized_pnl": match.realized_pnl,
+                            "close_price": match.close_price,
+                            "original_lot_side": match.lot.side,
                             "original_trade_id": match.lot.originating_trade_id,
                             "decomposition_path": leg.decomposition_path,
                         },
@@ -198,68 +223,49 @@ def _handle_lot_tracking(state: EngineState, event: ClientTradeEvent) -> List[Ou
                 )
 
             # If not fully matched, create lot for remainder
-            matched_total = sum(m.matched_quantity for m in matches)
             if matched_total < leg.quantity:
                 remainder = leg.quantity - matched_total
-                lots = decomposer.legs_to_lots(
-                    [leg],
-                    event.trade_id,
-                    event.timestamp,
-                    open_mids,
-                )
-                for lot in lots:
-                    # Adjust quantity to remainder
-                    adjusted_lot = replace(
-                        lot,
-                        quantity=remainder,
-                        original_quantity=remainder,
-                    )
-                    state.lot_manager.add_lot(adjusted_lot)
-
-                    outputs.append(
-                        OutputRecord(
-                            timestamp=event.timestamp,
-                            record_type="lot_created",
-                            data={
-                                "trade_id": event.trade_id,
-                                "lot_id": adjusted_lot.lot_id,
-                                "risk_pair": adjusted_lot.risk_pair,
-                                "side": adjusted_lot.side.value,
-                                "quantity": str(adjusted_lot.quantity),
-                                "trade_price": str(adjusted_lot.trade_price),
-                                "open_mid": str(adjusted_lot.open_mid),
-                                "decomposition_path": adjusted_lot.decomposition_path,
-                            },
-                        )
-                    )
-        else:
-            # Increases position - create new lot
-            lots = decomposer.legs_to_lots(
-                [leg],
-                event.trade_id,
-                event.timestamp,
-                open_mids,
-            )
-
-            for lot in lots:
-                state.lot_manager.add_lot(lot)
+                # Lot for the remainder only
+                adjusted_lot = leg_to_lot(leg, trade_id, timestamp, open_mid, quantity=remainder)
+                lot_manager.add_lot(adjusted_lot)
 
                 outputs.append(
                     OutputRecord(
-                        timestamp=event.timestamp,
+                        timestamp=timestamp,
                         record_type="lot_created",
                         data={
-                            "trade_id": event.trade_id,
-                            "lot_id": lot.lot_id,
-                            "risk_pair": lot.risk_pair,
-                            "side": lot.side.value,
-                            "quantity": str(lot.quantity),
-                            "trade_price": str(lot.trade_price),
-                            "open_mid": str(lot.open_mid),
-                            "decomposition_path": lot.decomposition_path,
+                            "trade_id": trade_id,
+                            "lot_id": adjusted_lot.lot_id,
+                            "risk_pair": adjusted_lot.risk_pair,
+                            "side": adjusted_lot.side,
+                            "quantity": adjusted_lot.quantity,
+                            "trade_price": adjusted_lot.trade_price,
+                            "open_mid": adjusted_lot.open_mid,
+                            "decomposition_path": adjusted_lot.decomposition_path,
                         },
                     )
                 )
+        else:
+            # Increases position - create new lot
+            lot = leg_to_lot(leg, trade_id, timestamp, open_mid)
+            lot_manager.add_lot(lot)
+
+            outputs.append(
+                OutputRecord(
+                    timestamp=timestamp,
+                    record_type="lot_created",
+                    data={
+                        "trade_id": trade_id,
+                        "lot_id": lot.lot_id,
+                        "risk_pair": lot.risk_pair,
+                        "side": lot.side,
+                        "quantity": lot.quantity,
+                        "trade_price": lot.trade_price,
+                        "open_mid": lot.open_mid,
+                        "decomposition_path": lot.decomposition_path,
+                    },
+                )
+            )
 
     return outputs
 
@@ -274,25 +280,28 @@ def handle_market_update(
     - Market rate cache
 
     Outputs:
-    - Market data record (optional, can be verbose)
+    - Market data record (skipped when state.log_market_updates is False)
     """
     new_state = state.update_market_rate(
         event.currency_pair,
         event.bid,
         event.ask,
         event.mid,
+        timestamp=event.timestamp,
     )
-    new_state = new_state.increment_event_count(event.timestamp.isoformat())
 
     # Optionally log market updates (can be very verbose)
+    if not state.log_market_updates:
+        return new_state, []
+
     output = OutputRecord(
         timestamp=event.timestamp,
         record_type="market_update",
         data={
             "currency_pair": event.currency_pair,
-            "bid": str(event.bid),
-            "ask": str(event.ask),
-            "mid": str(event.mid),
+            "bid": event.bid,
+            "ask": event.ask,
+            "mid": event.mid,
         },
     )
 
@@ -311,8 +320,9 @@ def handle_config_update(
     Outputs:
     - Config change record
     """
-    new_state = state.update_config(event.config_key, str(event.config_value))
-    new_state = new_state.increment_event_count(event.timestamp.isoformat())
+    new_state = state.update_config(
+        event.config_key, str(event.config_value), timestamp=event.timestamp
+    )
 
     output = OutputRecord(
         timestamp=event.timestamp,
@@ -340,7 +350,7 @@ def handle_hedge_order(
     Outputs:
     - Order log record
     """
-    new_state = state.increment_event_count(event.timestamp.isoformat())
+    new_state = state.increment_event_count(event.timestamp)
 
     output = OutputRecord(
         timestamp=event.timestamp,
@@ -348,9 +358,9 @@ def handle_hedge_order(
         data={
             "order_id": event.order_id,
             "currency_pair": event.currency_pair,
-            "side": event.side.value,
-            "notional": str(event.notional),
-            "limit_price": str(event.limit_price) if event.limit_price else None,
+            "side": event.side,
+            "notional": event.notional,
+            "limit_price": event.limit_price if event.limit_price else None,
         },
     )
 
@@ -370,32 +380,29 @@ def handle_hedge_fill(
     Outputs:
     - Fill log record
     """
-    # Apply hedge trade (same as client trade from desk perspective)
+    # Apply hedge trade (same as client trade from desk perspective), with any
+    # slippage cost taken from quote currency cash in the same update
     new_state = apply_trade(
         state,
         event.currency_pair,
         event.side,
         event.notional,
         event.fill_price,
+        quote_cash_delta=event.slippage_cash_delta,
+        timestamp=event.timestamp,
+        currencies=(event.base_ccy, event.quote_ccy),
     )
 
-    # Apply slippage cost (reduce quote currency cash)
-    if event.slippage != 0:
-        _, quote_ccy = event.currency_pair.split("/")
-        new_state = new_state.update_cash(quote_ccy, -event.slippage)
-
-    new_state = new_state.increment_event_count(event.timestamp.isoformat())
-
     output = OutputRecord(
         timestamp=event.timestamp,
         record_type="hedge_fill",
         data={
             "order_id": event.order_id,
             "currency_pair": event.currency_pair,
-            "side": event.side.value,
-            "notional": str(event.notional),
-            "fill_price": str(event.fill_price),
-            "slippage": str(event.slippage),
+            "side": event.side,
+            "notional": event.notional,
+            "fill_price": event.fill_price,
+            "slippage": event.slippage,
         },
     )
 
@@ -403,7 +410,7 @@ def handle_hedge_fill(
 
 
 def handle_clock_tick(
-    state: EngineState, event: ClockTickEvent
+    state: EngineState, event: ClockTickEvent, strings: DecimalStrCache | None = None
 ) -> tuple[EngineState, List[OutputRecord]]:
     """
     Handle clock tick event.
@@ -420,32 +427,27 @@ def handle_clock_tick(
 
     Outputs:
     - Snapshot record with all state and metrics
+
+    strings is the run's snapshot string cache (see EventProcessor); without
+    one, every value is rendered afresh.
     """
-    new_state = state.increment_event_count(event.timestamp.isoformat())
+    new_state = state.increment_event_count(event.timestamp)
 
     # Compute metrics
     exposures = state.compute_exposures()
 
-    # Calculate total equity in reporting currency
-    converter = CurrencyConverter(state)
-    total_equity = Decimal("0")
+    # Sum all cash balances converted to reporting currency (unquoted currencies are skipped)
+    total_equity = state.converter.sum_to_reporting(state.cash_balances)
 
-    # Sum all cash balances converted to reporting currency
-    for currency, balance in state.cash_balances.items():
-        try:
-            converted = converter.convert_to_reporting(balance, currency)
-            total_equity += converted
-        except Exception:
-            # If conversion fails, skip (or handle differently)
-            pass
+    render = (strings or DecimalStrCache()).render
 
     # Prepare output data
     output_data = {
         "tick_label": event.tick_label,
-        "cash_balances": {k: str(v) for k, v in state.cash_balances.items()},
-        "positions": {k: str(v) for k, v in state.positions.items()},
-        "exposures": {k: str(v) for k, v in exposures.items()},
-        "total_equity_reporting": str(total_equity),
+        "cash_balances": render("cash_balances", state.cash_balances),
+        "positions": render("positions", state.positions),
+        "exposures": render("exposures", exposures),
+        "total_equity_reporting": total_equity,
         "reporting_currency": state.reporting_currency,
         "event_count": state.event_count,
     }
@@ -463,7 +465,7 @@ def handle_clock_tick(
             "total_unrealized_pnl": str(total_unrealized_pnl),
             "total_open_lots": lot_stats["total_open_lots"],
             "total_closed_lots": lot_stats["total_closed_lots"],
-            "net_positions_by_risk_pair": {k: str(v) for k, v in net_positions.items()},
+            "net_positions_by_risk_pair": render("net_positions_by_risk_pair", net_positions),
         }
 
     output = OutputRecord(
@@ -5,12 +5,15 @@ Handles Parquet and JSONL formats with schema validation.
 """
 
 import json
+import sys
 from datetime import datetime
 from decimal import Decimal
+from itertools import repeat
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Iterator, List
 
 import pyarrow as pa
+import pyarrow.compute as pc
 import pyarrow.parquet as pq
 import structlog
 
@@ -26,6 +29,7 @@ from efxlab.events import (
     Side,
 )
 from efxlab.handlers import OutputRecord
+from efxlab.state import DecimalStrCache
 
 logger = structlog.get_logger()
 
@@ -98,6 +102,136 @@ CLOCK_TICK_SCHEMA = pa.schema(
 )
 
 
+# Column -> event builders. Each takes the table's {column: values} lists and
+# lazily yields events, built positionally in dataclass field order, so no
+# per-row dict is allocated and a failure surfaces at the row that caused it.
+Columns = Dict[str, List[Any]]
+
+
+def _optional_decimal(value: Any) -> Decimal | None:
+    return Decimal(value) if value else None
+
+
+def _client_trades_from_columns(cols: Columns) -> Iterator[BaseEvent]:
+    return map(
+        ClientTradeEvent,
+        cols["timestamp"],
+        cols["sequence_id"],
+        repeat(EventType.CLIENT_TRADE),
+        map(sys.intern, cols["currency_pair"]),
+        map(Side.__getitem__, cols["side"]),
+        map(Decimal, cols["notional"]),
+        map(Decimal, cols["price"]),
+        cols["client_id"],
+        cols["trade_id"],
+    )
+
+
+def _market_updates_from_columns(cols: Columns) -> Iterator[BaseEvent]:
+    return map(
+        MarketUpdateEvent,
+        cols["timestamp"],
+        cols["sequence_id"],
+        repeat(EventType.MARKET_UPDATE),
+        map(sys.intern, cols["currency_pair"]),
+        map(Decimal, cols["bid"]),
+        map(Decimal, cols["ask"]),
+        map(Decimal, cols["mid"]),
+    )
+
+
+def _config_updates_from_columns(cols: Columns) -> Iterator[BaseEvent]:
+    return map(
+        ConfigUpdateEvent,
+        cols["timestamp"],
+        cols["sequence_id"],
+        repeat(EventType.CONFIG_UPDATE),
+        cols["config_key"],
+        cols["config_value"],
+    )
+
+
+def _hedge_orders_from_columns(cols: Columns) -> Iterator[BaseEvent]:
+    return map(
+        HedgeOrderEvent,
+        cols["timestamp"],
+        cols["sequence_id"],
+        repeat(EventType.HEDGE_ORDER),
+        cols["order_id"],
+        map(sys.intern, cols["currency_pair"]),
+        map(Side.__getitem__, cols["side"]),
+        map(Decimal, cols["notional"]),
+        map(_optional_decimal, cols["limit_price"]),
+    )
+
+
+def _hedge_fills_from_columns(cols: Columns) -> Iterator[BaseEvent]:
+    return map(
+        HedgeFillEvent,
+        cols["timestamp"],
+        cols["sequence_id"],
+        repeat(EventType.HEDGE_FILL),
+        cols["order_id"],
+        map(sys.intern, cols["currency_pair"]),
+        map(Side.__getitem__, cols["side"]),
+        map(Decimal, cols["notional"]),
+        map(Decimal, cols["fill_price"]),
+        map(Decimal, cols.get("slippage") or repeat("0")),
+    )
+
+
+def _clock_ticks_from_columns(cols: Columns) -> Iterator[BaseEvent]:
+    return map(
+        ClockTickEvent,
+        cols["timestamp"],
+        cols["sequence_id"],
+        repeat(EventType.CLOCK_TICK),
+        cols["tick_label"],
+    )
+
+
+# Common type for merge sort keys; all input schemas use UTC microseconds
+_SORT_TIMESTAMP_TYPE = pa.timestamp("us", tz="UTC")
+
+_COLUMN_PARSERS: Dict[EventType, Callable[[Columns], Iterator[BaseEvent]]] = {
+    EventType.CLIENT_TRADE: _client_trades_from_columns,
+    EventType.MARKET_UPDATE: _market_updates_from_columns,
+    EventType.CONFIG_UPDATE: _config_updates_from_columns,
+    EventType.HEDGE_ORDER: _hedge_orders_from_columns,
+    EventType.HEDGE_FILL: _hedge_fills_from_columns,
+    EventType.CLOCK_TICK: _clock_ticks_from_columns,
+}
+
+
+def _read_events(file_path: Path, event_type: EventType) -> tuple[List[BaseEvent], pa.Table]:
+    """Read a Parquet event file, returning its events and the Arrow table they came from."""
+    logger.info("loading_events", file_path=str(file_path), event_type=event_type.value)
+
+    parse_columns = _COLUMN_PARSERS.get(event_type)
+    if parse_columns is None:
+        raise ValueError(f"Unknown event type: {event_type}")
+
+    table = pq.read_table(file_path)
+    columns = table.to_pydict()
+    events: List[BaseEvent] = []
+
+    try:
+        events.extend(parse_columns(columns))
+    except Exception as e:
+        # Events are built in row order, so the failing row is the next one
+        row_index = len(events)
+        logger.error(
+            "failed_to_parse_event",
+            row={name: values[row_index] for name, values in columns.items()},
+            error=str(e),
+            error_type=type(e).__name__,
+        )
+        raise
+
+    logger.info("events_loaded", count=len(events), event_type=event_type.value)
+    return events, table
+
+
 def load_events_from_parquet(file_path: Path, event_type: EventType) -> List[BaseEvent]:
     """
     Load events from a Parquet file.
@@ -109,89 +243,7 @@ def load_events_from_parquet(file_path: Path, event_type: EventType) -> List[Bas
     Returns:
         List of event objects
     """
-    logger.info("loading_events", file_path=str(file_path), event_type=event_type.value)
-
-    table = pq.read_table(file_path)
-    events: List[BaseEvent] = []
-
-    for row in table.to_pylist():
-        try:
-            if event_type == EventType.CLIENT_TRADE:
-                event = ClientTradeEvent(
-                    timestamp=row["timestamp"],
-                    sequence_id=row["sequence_id"],
-                    event_type=EventType.CLIENT_TRADE,
-                    currency_pair=row["currency_pair"],
-                    side=Side[row["side"]],
-                    notional=Decimal(row["notional"]),
-                    price=Decimal(row["price"]),
-                    client_id=row["client_id"],
-                    trade_id=row["trade_id"],
-                )
-            elif event_type == EventType.MARKET_UPDATE:
-                event = MarketUpdateEvent(
-                    timestamp=row["timestamp"],
-                    sequence_id=row["sequence_id"],
-                    event_type=EventType.MARKET_UPDATE,
-                    currency_pair=row["currency_pair"],
-                    bid=Decimal(row["bid"]),
-                    ask=Decimal(row["ask"]),
-                    mid=Decimal(row["mid"]),
-                )
-            elif event_type == EventType.CONFIG_UPDATE:
-                event = ConfigUpdateEvent(
-                    timestamp=row["timestamp"],
-                    sequence_id=row["sequence_id"],
-                    event_type=EventType.CONFIG_UPDATE,
-                    config_key=row["config_key"],
-                    config_value=row["config_value"],
-                )
-            elif event_type == EventType.HEDGE_ORDER:
-                limit_price = Decimal(row["limit_price"]) if row["limit_price"] else None
-                event = HedgeOrderEvent(
-                    timestamp=row["timestamp"],
-                    sequence_id=row["sequence_id"],
-                    event_type=EventType.HEDGE_ORDER,
-                    order_id=row["order_id"],
-                    currency_pair=row["currency_pair"],
-                    side=Side[row["side"]],
-                    notional=Decimal(row["notional"]),
-                    limit_price=limit_price,
-                )
-            elif event_type == EventType.HEDGE_FILL:
-                event = HedgeFillEvent(
-                    timestamp=row["timestamp"],
-                    sequence_id=row["sequence_id"],
-                    event_type=EventType.HEDGE_FILL,
-                    order_id=row["order_id"],
-                    currency_pair=row["currency_pair"],
-                    side=Side[row["side"]],
-                    notional=Decimal(row["notional"]),
-                    fill_price=Decimal(row["fill_price"]),
-                    slippage=Decimal(row.get("slippage", "0")),
-                )
-            elif event_type == EventType.CLOCK_TICK:
-                event = ClockTickEvent(
-                    timestamp=row["timestamp"],
-                    sequence_id=row["sequence_id"],
-                    event_type=EventType.CLOCK_TICK,
-                    tick_label=row["tick_label"],
-                )
-            else:
-                raise ValueError(f"Unknown event type: {event_type}")
-
-            events.append(event)
-
-        except Exception as e:
-            logger.error(
-                "failed_to_parse_event",
-                row=row,
-                error=str(e),
-                error_type=type(e).__name__,
-            )
-            raise
-
-    logger.info("events_loaded", count=len(events), event_type=event_type.value)
+    events, _ = _read_events(file_path, event_type)
     return events
 
 
@@ -199,6 +251,9 @@ def load_and_merge_events(event_files: Dict[EventType, Path]) -> List[BaseEvent]
     """
     Load events from multiple files and merge into single sorted list.
 
+    The (timestamp, sequence_id) ordering of BaseEvent is computed by Arrow on
+    the raw key columns rather than by comparing event objects in Python.
+
     Args:
         event_files: Mapping of event types to file paths
 
@@ -206,23 +261,113 @@ def load_and_merge_events(event_files: Dict[EventType, Path]) -> List[BaseEvent]
         Sorted list of all events
     """
     all_events: List[BaseEvent] = []
+    timestamps: List[pa.ChunkedArray] = []
+    sequence_ids: List[pa.ChunkedArray] = []
 
     for event_type, file_path in event_files.items():
         if file_path.exists():
-            events = load_events_from_parquet(file_path, event_type)
+            events, table = _read_events(file_path, event_type)
             all_events.extend(events)
+            timestamps.append(table.column("timestamp").cast(_SORT_TIMESTAMP_TYPE))
+            sequence_ids.append(table.column("sequence_id").cast(pa.int64()))
         else:
             logger.warning(
                 "event_file_not_found", event_type=event_type.value, file_path=str(file_path)
             )
 
-    # Sort events deterministically
-    all_events.sort()  # Uses BaseEvent.__lt__ (timestamp, sequence_id)
+    # Sort events deterministically; the position column makes ties keep load
+    # order, exactly as the stable list.sort() over BaseEvent.__lt__ did
+    if all_events:
+        sort_keys = pa.table(
+            {
+                "timestamp": pa.chunked_array(
+                    [chunk for column in timestamps for chunk in column.chunks],
+                    type=_SORT_TIMESTAMP_TYPE,
+                ),
+                "sequence_id": pa.chunked_array(
+                    [chunk for column in sequence_ids for chunk in column.chunks],
+                    type=pa.int64(),
+                ),
+                "position": pa.array(range(len(all_events)), type=pa.int64()),
+            }
+        )
+        order = pc.sort_indices(
+            sort_keys,
+            sort_keys=[
+                ("timestamp", "ascending"),
+                ("sequence_id", "ascending"),
+                ("position", "ascending"),
+            ],
+        )
+        all_events = [all_events[i] for i in order.to_pylist()]
 
     logger.info("events_merged_and_sorted", total_count=len(all_events))
     return all_events
 
 
+# JSONL output is accumulated in batches of lines and written through a large buffer
+_JSONL_BATCH_LINES = 4096
+_WRITE_BUFFER_BYTES = 1 << 20
+
+
+class JsonlRecordWriter:
+    """
+    Incremental JSONL writer for output records.
+
+    Lets the processor flush records to disk in chunks as events are handled,
+    so the audit log never has to be held in memory in full. Produces exactly
+    the lines write_output_records_jsonl does.
+    """
+
+    def __init__(self, output_path: Path):
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        self.output_path = output_path
+        self.count = 0
+        self._file = open(output_path, "w", buffering=_WRITE_BUFFER_BYTES)
+        # Same encoder json.dumps uses by default, so lines are unchanged
+        self._encode = json.JSONEncoder().encode
+        # Records from one event share its timestamp object; format it once per event
+        self._last_timestamp: datetime | None = None
+        self._timestamp_json = ""
+
+    def write(self, records: List[OutputRecord]) -> None:
+        """Append records to the log."""
+        encode = self._encode
+        last_timestamp = self._last_timestamp
+        timestamp_json = self._timestamp_json
+        batch: List[str] = []
+
+        for record in records:
+            if record.timestamp is not last_timestamp:
+                last_timestamp = record.timestamp
+                timestamp_json = encode(last_timestamp.isoformat())
+            # Fixed keys are spliced in directly rather than via a per-record
+            # wrapper dict; the text matches json.dumps of that dict exactly
+            batch.append(
+                f'{{"timestamp": {timestamp_json}, '
+                f'"record_type": {encode(record.record_type)}, '
+                f'"data": {encode(record.rendered_data())}}}\n'
+            )
+            if len(batch) >= _JSONL_BATCH_LINES:
+                self._file.writelines(batch)
+                batch.clear()
+        self._file.writelines(batch)
+
+        self._last_timestamp = last_timestamp
+        self._timestamp_json = timestamp_json
+        self.count += len(records)
+
+    def close(self) -> None:
+        """Flush and close the underlying file."""
+        self._file.close()
+
+    def __enter__(self) -> "JsonlRecordWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
 def write_output_records_jsonl(records: List[OutputRecord], output_path: Path) -> None:
     """
     Write output records to JSONL file (append-only log).
@@ -233,16 +378,8 @@ def write_output_records_jsonl(records: List[OutputRecord], output_path: Path) -
     """
     logger.info("writing_output_records", path=str(output_path), count=len(records))
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-
-    with open(output_path, "w") as f:
-        for record in records:
-            line = {
-                "timestamp": record.timestamp.isoformat(),
-                "record_type": record.record_type,
-                "data": record.data,
-            }
-            f.write(json.dumps(line) + "\n")
+    with JsonlRecordWriter(output_path) as writer:
+        writer.write(records)
 
     logger.info("output_records_written", path=str(output_path))
 
@@ -257,27 +394,48 @@ def write_snapshots_parquet(records: List[OutputRecord], output_path: Path) -> N
         records: List of output records
         output_path: Path to output file
     """
-    # Filter to clock tick records only
-    snapshots = [r for r in records if r.record_type == "clock_tick"]
-
-    if not snapshots:
+    # Single pass over the record stream, appending straight into columns
+    timestamps: List[datetime] = []
+    tick_labels: List[str] = []
+    event_counts: List[int] = []
+    reporting_currencies: List[str] = []
+    total_equities: List[str] = []
+    cash_balances: List[str] = []
+    positions: List[str] = []
+    exposures: List[str] = []
+    dumps = json.dumps
+
+    for record in records:
+        if record.record_type != "clock_tick":
+            continue
+        snapshot = record.rendered_data()
+        timestamps.append(record.timestamp)
+        tick_labels.append(snapshot["tick_label"])
+        event_counts.append(snapshot["event_count"])
+        reporting_currencies.append(snapshot["reporting_currency"])
+        total_equities.append(snapshot["total_equity_reporting"])
+        cash_balances.append(dumps(snapshot["cash_balances"]))
+        positions.append(dumps(snapshot["positions"]))
+        exposures.append(dumps(snapshot["exposures"]))
+
+    if not timestamps:
         logger.warning("no_snapshots_to_write")
         return
 
-    logger.info("writing_snapshots", path=str(output_path), count=len(snapshots))
+    logger.info("writing_snapshots", path=str(output_path), count=len(timestamps))
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
     # Convert to Arrow table
     data = {
-        "timestamp": [s.timestamp for s in snapshots],
-        "tick_label": [s.data["tick_label"] for s in snapshots],
-        "event_count": [s.data["event_count"] for s in snapshots],
-        "reporting_currency": [s.data["reporting_currency"] for s in snapshots],
-        "total_equity_reporting": [s.data["total_equity_reporting"] for s in snapshots],
-        "cash_balances": [json.dumps(s.data["cash_balances"]) for s in snapshots],
-        "positions": [json.dumps(s.data["positions"]) for s in snapshots],
-        "exposures": [json.dumps(s.data["exposures"]) for s in snapshots],
+        "timestamp": timestamps,
+        "tick_label": tick_labels,
+        "event_count": event_counts,
+        "reporting_currency": reporting_currencies,
+        "total_equity_reporting": total_equities,
+        "cash_balances": cash_balances,
+        "positions": positions,
+        "exposures": exposures,
     }
 
     table = pa.table(data)
@@ -286,19 +444,22 @@ def write_snapshots_parquet(records: List[OutputRecord], output_path: Path) -> N
     logger.info("snapshots_written", path=str(output_path))
 
 
-def write_state_snapshot(state: Any, output_path: Path) -> None:
+def write_state_snapshot(
+    state: Any, output_path: Path, strings: DecimalStrCache | None = None
+) -> None:
     """
     Write final state to JSON file.
 
     Args:
         state: Engine state (must have to_dict method)
         output_path: Path to output file
+        strings: Optional snapshot string cache of the run that produced state
     """
     logger.info("writing_state_snapshot", path=str(output_path))
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
     with open(output_path, "w") as f:
-        json.dump(state.to_dict(), f, indent=2)
+        json.dump(state.to_dict(strings=strings), f, indent=2)
 
     logger.info("state_snapshot_written", path=str(output_path))
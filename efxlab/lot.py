@@ -4,21 +4,28 @@ Lot tracking for position management with FIFO matching.
 Lots represent individual position entries that can be matched for internalization.
 """
 
-from dataclasses import dataclass, replace
+import sys
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 from decimal import Decimal
-from typing import List
+from typing import Final, List, Tuple
 
 from efxlab.events import Side
 
+# Signed multiplier per side, shared by every lot instead of built per P&L call
+_DIRECTION = {Side.BUY: Decimal("1"), Side.SELL: Decimal("-1")}
+_ZERO: Final[Decimal] = Decimal("0")
 
-@dataclass(frozen=True)
+
+@dataclass(slots=True, eq=False)
 class Lot:
     """
     A lot represents a single position entry in a risk pair.
 
-    Lots are immutable. When partially matched, a new lot with reduced
-    quantity is created.
+    Lots are treated as immutable. When partially matched, a new lot with
+    reduced quantity is created. The class is not frozen, so construction
+    (one per match) skips the frozen-instance __setattr__ path; equality and
+    hashing are by identity, so a lot stays findable in sets and dict keys.
 
     Attributes:
         lot_id: Unique identifier
@@ -33,6 +40,7 @@ class Lot:
         open_mid: Market mid at lot open
         close_timestamp: When fully matched (None if open)
         close_mid: Market mid at close (None if open)
+        direction: +1 for BUY, -1 for SELL (derived from side)
     """
 
     lot_id: str
@@ -47,8 +55,13 @@ class Lot:
     open_mid: Decimal
     close_timestamp: datetime | None = None
     close_mid: Decimal | None = None
+    direction: Decimal = field(init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
+        self.direction = _DIRECTION[self.side]
+        # Few distinct values across many lots; share one string object for each
+        self.risk_pair = sys.intern(self.risk_pair)
+        self.decomposition_path = sys.intern(self.decomposition_path)
         # Allow zero quantity only for closed lots
         if self.quantity < 0:
             raise ValueError(f"Lot quantity cannot be negative, got {self.quantity}")
@@ -69,12 +82,12 @@ class Lot:
     @property
     def is_buy(self) -> bool:
         """Check if lot is a buy (desk bought base currency)."""
-        return self.side == Side.BUY
+        return self.side is Side.BUY
 
     @property
     def is_sell(self) -> bool:
         """Check if lot is a sell (desk sold base currency)."""
-        return self.side == Side.SELL
+        return self.side is Side.SELL
 
     def reduce_quantity(self, amount: Decimal) -> "Lot":
         """Return new lot with reduced quantity."""
@@ -84,11 +97,33 @@ class Lot:
             raise ValueError(f"Cannot reduce by {amount}, only {self.quantity} remaining")
 
         new_quantity = self.quantity - amount
-        return replace(self, quantity=new_quantity)
+        if new_quantity == 0 and self.close_timestamp is None:
+            raise ValueError("Open lot cannot have zero quantity")
+        return self._copy(new_quantity, self.close_timestamp, self.close_mid)
 
     def close(self, close_timestamp: datetime, close_mid: Decimal) -> "Lot":
         """Return new closed lot. Quantity should be zero."""
-        return replace(self, close_timestamp=close_timestamp, close_mid=close_mid)
+        return self._copy(self.quantity, close_timestamp, close_mid)
+
+    def _copy(
+        self,
+        quantity: Decimal,
+        close_timestamp: datetime | None,
+        close_mid: Decimal | None,
+    ) -> "Lot":
+        """
+        Copy with new quantity/close fields, skipping __post_init__.
+
+        Internal fast path for copies whose arguments the caller has already
+        checked; every other field is carried over from a validated lot.
+        """
+        lot = object.__new__(Lot)
+        for name in _LOT_FIELDS:
+            setattr(lot, name, getattr(self, name))
+        lot.quantity = quantity
+        lot.close_timestamp = close_timestamp
+        lot.close_mid = close_mid
+        return lot
 
     def compute_unrealized_pnl(self, current_mid: Decimal) -> Decimal:
         """
@@ -98,10 +133,9 @@ class Lot:
         Direction: +1 for BUY, -1 for SELL
         """
         if self.is_closed:
-            return Decimal("0")
+            return _ZERO
 
-        direction = Decimal("1") if self.is_buy else Decimal("-1")
-        return (current_mid - self.trade_price) * self.quantity * direction
+        return (current_mid - self.trade_price) * self.quantity * self.direction
 
     def get_unrealized_pnl(self, current_mid: Decimal) -> Decimal:
         """Alias for compute_unrealized_pnl() for convenience."""
@@ -116,19 +150,23 @@ class Lot:
         if quantity_closed <= 0 or quantity_closed > self.original_quantity:
             raise ValueError(f"Invalid close quantity: {quantity_closed}")
 
-        direction = Decimal("1") if self.is_buy else Decimal("-1")
-        return (close_price - self.trade_price) * quantity_closed * direction
+        return (close_price - self.trade_price) * quantity_closed * self.direction
+
 
+# Every Lot field, including derived ones, so _copy cannot miss a field added later
+_LOT_FIELDS: Final[Tuple[str, ...]] = tuple(f.name for f in fields(Lot))
 
-@dataclass
+
+@dataclass(slots=True)
 class LotMatch:
     """
     Result of matching a lot against an offsetting trade.
 
     Attributes:
-        lot: The original lot being matched
+        lot: The original lot being matched (as it was before this match)
         matched_quantity: How much of the lot was matched
-        remaining_lot: Updated lot with reduced quantity (None if fully matched)
+        remaining_lot: Updated lot with reduced quantity (None if fully matched);
+            later matches never modify it
         realized_pnl: P&L from this match
         close_price: Price at which match occurred
         close_timestamp: When match occurred
@@ -146,19 +184,35 @@ class LotQueue:
     """
     FIFO queue of lots for a single risk pair.
 
-    Maintains open lots in order of arrival for matching.
+    Maintains open lots in order of arrival for matching. Trades net against
+    the book, so open lots are normally all on one side and matching consumes
+    a run of lots at the head: those are dropped with one slice deletion
+    rather than by rebuilding the list. The net position is cached: appends
+    extend it in place, matching invalidates it.
+
+    A partially matched lot is replaced by a reduced copy rather than
+    mutated, since LotMatch records returned earlier may still reference it.
     """
 
     def __init__(self, risk_pair: str):
         self.risk_pair = risk_pair
         self.open_lots: List[Lot] = []
         self.closed_lots: List[Lot] = []
+        self._net_position: Decimal | None = _ZERO
+
+    @property
+    def open_lot_count(self) -> int:
+        """Number of open lots."""
+        return len(self.open_lots)
 
     def add_lot(self, lot: Lot) -> None:
         """Add a new lot to the queue."""
         if lot.risk_pair != self.risk_pair:
             raise ValueError(f"Lot risk pair {lot.risk_pair} does not match queue {self.risk_pair}")
         self.open_lots.append(lot)
+        # Appending continues the same in-order fold get_net_position would do
+        if self._net_position is not None:
+            self._net_position = self._accumulate(self._net_position, lot)
 
     def match(
         self,
@@ -184,57 +238,64 @@ class LotQueue:
         if quantity <= 0:
             raise ValueError(f"Match quantity must be positive, got {quantity}")
 
-        # Determine opposite side for matching
-        opposite_side = Side.SELL if side == Side.BUY else Side.BUY
+        opposite_side = side.opposite
+        open_lots = self.open_lots
 
         matches: List[LotMatch] = []
         remaining_to_match = quantity
-        new_open_lots: List[Lot] = []
-
-        for lot in self.open_lots:
-            if remaining_to_match <= 0:
-                # No more to match, keep remaining lots
-                new_open_lots.append(lot)
-                continue
-
-            if lot.side != opposite_side:
+        # Positions of fully matched lots, in order
+        closed_positions: List[int] = []
+
+        # Bound appends keep attribute lookups out of the loop body
+        keep_closed = self.closed_lots.append
+        record_match = matches.append
+        index = 0
+        lot_count = len(open_lots)
+        while remaining_to_match > 0 and index < lot_count:
+            lot = open_lots[index]
+            if lot.side is not opposite_side:
                 # Wrong side, can't match
-                new_open_lots.append(lot)
+                index += 1
                 continue
 
-            # Match this lot
-            matched_qty = min(lot.quantity, remaining_to_match)
-            realized_pnl = lot.compute_realized_pnl(matched_qty, close_price)
+            # Match this lot. matched_qty is positive and within the lot, so the
+            # realized P&L is computed inline without compute_realized_pnl checks.
+            lot_quantity = lot.quantity
+            matched_qty = min(lot_quantity, remaining_to_match)
+            realized_pnl = (close_price - lot.trade_price) * matched_qty * lot.direction
 
-            if matched_qty == lot.quantity:
+            if matched_qty == lot_quantity:
                 # Fully matched - close the lot by setting quantity=0 directly
-                closed_lot = replace(
-                    lot,
-                    quantity=Decimal("0"),
-                    close_timestamp=close_timestamp,
-                    close_mid=close_price,
-                )
-                self.closed_lots.append(closed_lot)
+                keep_closed(lot._copy(_ZERO, close_timestamp, close_price))
                 remaining_lot = None
+                closed_positions.append(index)
             else:
-                # Partially matched
-                remaining_lot = lot.reduce_quantity(matched_qty)
-                new_open_lots.append(remaining_lot)
+                # Partially matched - the reduced lot keeps its place in the queue
+                remaining_lot = lot._copy(lot_quantity - matched_qty, None, None)
+                open_lots[index] = remaining_lot
 
-            matches.append(
+            # Positional: lot, matched_quantity, remaining_lot, realized_pnl,
+            # close_price, close_timestamp
+            record_match(
                 LotMatch(
-                    lot=lot,
-                    matched_quantity=matched_qty,
-                    remaining_lot=remaining_lot,
-                    realized_pnl=realized_pnl,
-                    close_price=close_price,
-                    close_timestamp=close_timestamp,
+                    lot, matched_qty, remaining_lot, realized_pnl, close_price, close_timestamp
                 )
             )
 
             remaining_to_match -= matched_qty
+            index += 1
 
-        self.open_lots = new_open_lots
+        if closed_positions:
+            closed_count = len(closed_positions)
+            if closed_positions[-1] == closed_count - 1:
+                # The closed lots are the head of the queue (the netted case)
+                del open_lots[:closed_count]
+            else:
+                closed = set(closed_positions)
+                open_lots[:] = [lot for i, lot in enumerate(open_lots) if i not in closed]
+
+        if matches:
+            self._net_position = None
 
         return matches
 
@@ -244,23 +305,34 @@ class LotQueue:
 
         Returns signed notional: positive for net long, negative for net short.
         """
-        net = Decimal("0")
-        for lot in self.open_lots:
-            if lot.is_buy:
-                net += lot.quantity
-            else:
-                net -= lot.quantity
+        net = self._net_position
+        if net is None:
+            net = _ZERO
+            for lot in self.open_lots:
+                net = self._accumulate(net, lot)
+            self._net_position = net
         return net
 
+    @staticmethod
+    def _accumulate(net: Decimal, lot: Lot) -> Decimal:
+        """Add a lot's signed quantity to a running net position."""
+        if lot.side is Side.BUY:
+            return net + lot.quantity
+        return net - lot.quantity
+
     def get_total_unrealized_pnl(self, current_mid: Decimal) -> Decimal:
         """Calculate total unrealized P&L for all open lots."""
-        return sum(lot.compute_unrealized_pnl(current_mid) for lot in self.open_lots)
+        # Open lots are never closed, so skip the per-lot is_closed check
+        total = _ZERO
+        for lot in self.open_lots:
+            total += (current_mid - lot.trade_price) * lot.quantity * lot.direction
+        return total
 
     def to_dict(self) -> dict:
         """Serialize queue state for output."""
         return {
             "risk_pair": self.risk_pair,
-            "open_lot_count": len(self.open_lots),
+            "open_lot_count": self.open_lot_count,
             "closed_lot_count": len(self.closed_lots),
             "net_position": str(self.get_net_position()),
             "open_lots": [
@@ -5,13 +5,16 @@ Lot manager for tracking positions across all risk pairs.
 from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal
-from typing import Dict, List
+from typing import Dict, Final, List
 
-from efxlab.events import Side
+from efxlab.events import Side, split_pair
 from efxlab.lot import Lot, LotMatch, LotQueue
 
+# Net position of unqueued risk pairs and the start of P&L totals
+_ZERO: Final[Decimal] = Decimal("0")
 
-@dataclass
+
+@dataclass(slots=True)
 class LotConfig:
     """
     Configuration for lot tracking system.
@@ -44,7 +47,7 @@ class LotConfig:
         for pair in self.risk_pairs:
             if "/" not in pair:
                 raise ValueError(f"Invalid risk pair format: {pair}")
-            base, quote = pair.split("/")
+            base, quote = split_pair(pair)
             if quote != self.reporting_currency:
                 raise ValueError(
                     f"Risk pair {pair} must be quoted in reporting currency {self.reporting_currency}"
@@ -124,23 +127,24 @@ class LotManager:
 
     def get_net_position(self, risk_pair: str) -> Decimal:
         """Get net position for a risk pair."""
-        if risk_pair not in self.queues:
-            return Decimal("0")
-        return self.queues[risk_pair].get_net_position()
+        queue = self.queues.get(risk_pair)
+        if queue is None:
+            return _ZERO
+        return queue.get_net_position()
 
     def get_all_net_positions(self) -> Dict[str, Decimal]:
         """Get net positions for all risk pairs."""
         return {pair: queue.get_net_position() for pair, queue in self.queues.items()}
 
     def get_open_lots(self, risk_pair: str) -> List[Lot]:
-        """Get all open lots for a risk pair."""
+        """Get all open lots for a risk pair (a fresh list; no extra copy needed)."""
         if risk_pair not in self.queues:
             return []
-        return self.queues[risk_pair].open_lots.copy()
+        return self.queues[risk_pair].open_lots
 
     def get_all_open_lots(self) -> Dict[str, List[Lot]]:
-        """Get all open lots across all risk pairs."""
-        return {pair: queue.open_lots.copy() for pair, queue in self.queues.items()}
+        """Get all open lots across all risk pairs (fresh lists per pair)."""
+        return {pair: queue.open_lots for pair, queue in self.queues.items()}
 
     def compute_total_unrealized_pnl(self, market_mids: Dict[str, Decimal]) -> Decimal:
         """
@@ -152,20 +156,24 @@ class LotManager:
         Returns:
             Total unrealized P&L in reporting currency
         """
-        total_pnl = Decimal("0")
+        total_pnl = _ZERO
         for risk_pair, queue in self.queues.items():
-            if risk_pair in market_mids:
-                total_pnl += queue.get_total_unrealized_pnl(market_mids[risk_pair])
+            # Empty queues contribute nothing, so skip the mid lookup entirely
+            if not queue.open_lot_count:
+                continue
+            mid = market_mids.get(risk_pair)
+            if mid is not None:
+                total_pnl += queue.get_total_unrealized_pnl(mid)
         return total_pnl
 
     def get_lot_count_stats(self) -> Dict[str, int]:
         """Get statistics on lot counts."""
         return {
-            "total_open_lots": sum(len(q.open_lots) for q in self.queues.values()),
+            "total_open_lots": sum(q.open_lot_count for q in self.queues.values()),
             "total_closed_lots": sum(len(q.closed_lots) for q in self.queues.values()),
             "queues": {
                 pair: {
-                    "open": len(queue.open_lots),
+                    "open": queue.open_lot_count,
                     "closed": len(queue.closed_lots),
                 }
                 for pair, queue in self.queues.items()
@@ -3,16 +3,17 @@ CLI entry point for the eFX Lab simulation engine.
 """
 
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List
 
 import click
 import structlog
 import yaml
 
 from efxlab.events import EventType
+from efxlab.handlers import OutputRecord
 from efxlab.io_layer import (
+    JsonlRecordWriter,
     load_and_merge_events,
-    write_output_records_jsonl,
     write_snapshots_parquet,
     write_state_snapshot,
 )
@@ -95,27 +96,35 @@ def run(config: Path, log_level: str) -> None:
     initial_state = EngineState(
         reporting_currency=reporting_currency,
         lot_manager=lot_manager,
+        log_market_updates=config_data["outputs"].get("log_market_updates", True),
     )
 
-    # Process events
-    processor = EventProcessor(initial_state)
-    final_state = processor.process_events(events)
-
-    # Write outputs
     output_dir = Path(config_data["outputs"]["directory"])
     output_dir.mkdir(parents=True, exist_ok=True)
-
-    # Write audit log (JSONL)
     audit_log_path = output_dir / config_data["outputs"]["audit_log"]
-    write_output_records_jsonl(processor.get_output_records(), audit_log_path)
+    snapshots_path = output_dir / config_data["outputs"]["snapshots"]
+
+    # Process events, streaming the audit log (JSONL) to disk in chunks and
+    # keeping only the clock tick records needed for the snapshot file
+    snapshot_records: List[OutputRecord] = []
+
+    with JsonlRecordWriter(audit_log_path) as audit_writer:
+
+        def record_sink(records: List[OutputRecord]) -> None:
+            audit_writer.write(records)
+            snapshot_records.extend(r for r in records if r.record_type == "clock_tick")
+
+        processor = EventProcessor(initial_state, record_sink=record_sink)
+        final_state = processor.process_events(events)
+
+    logger.info("output_records_written", path=str(audit_log_path), count=audit_writer.count)
 
     # Write snapshots (Parquet)
-    snapshots_path = output_dir / config_data["outputs"]["snapshots"]
-    write_snapshots_parquet(processor.get_output_records(), snapshots_path)
+    write_snapshots_parquet(snapshot_records, snapshots_path)
 
     # Write final state (JSON)
     state_path = output_dir / config_data["outputs"]["final_state"]
-    write_state_snapshot(final_state, state_path)
+    write_state_snapshot(final_state, state_path, processor.snapshot_strings)
 
     logger.info(
         "simulation_completed",
@@ -194,32 +203,35 @@ def generate_sample_data(output_dir: Path, num_trades: int, num_ticks: int) -> N
         "AUD/USD": Decimal("0.7300"),
     }
 
+    # Spreads depend only on the pair, so halve them once up front (1 pip spread)
+    half_spreads = {pair: rate * Decimal("0.0001") / 2 for pair, rate in base_rates.items()}
+    one = Decimal("1")
+    gauss = random.gauss
+    choice = random.choice
+
+    pair_column: List[str] = []
+    bid_column: List[str] = []
+    ask_column: List[str] = []
+    mid_column: List[str] = []
+    for _ in range(num_ticks):
+        pair = choice(pairs)
+        mid = base_rates[pair] * (one + Decimal(gauss(0, 0.001)))
+        half_spread = half_spreads[pair]
+
+        pair_column.append(pair)
+        bid_column.append(str(mid - half_spread))
+        ask_column.append(str(mid + half_spread))
+        mid_column.append(str(mid))
+
     market_data = {
-        "timestamp": [],
-        "sequence_id": [],
-        "currency_pair": [],
-        "bid": [],
-        "ask": [],
-        "mid": [],
+        "timestamp": [base_time + timedelta(seconds=i * 10) for i in range(num_ticks)],
+        "sequence_id": list(range(num_ticks)),
+        "currency_pair": pair_column,
+        "bid": bid_column,
+        "ask": ask_column,
+        "mid": mid_column,
     }
-
-    seq_id = 0
-    for i in range(num_ticks):
-        timestamp = base_time + timedelta(seconds=i * 10)
-        pair = random.choice(pairs)
-        base_rate = base_rates[pair]
-        spread = base_rate * Decimal("0.0001")  # 1 pip spread
-        mid = base_rate * (Decimal("1") + (Decimal(random.gauss(0, 0.001))))
-        bid = mid - spread / 2
-        ask = mid + spread / 2
-
-        market_data["timestamp"].append(timestamp)
-        market_data["sequence_id"].append(seq_id)
-        market_data["currency_pair"].append(pair)
-        market_data["bid"].append(str(bid))
-        market_data["ask"].append(str(ask))
-        market_data["mid"].append(str(mid))
-        seq_id += 1
+    seq_id = num_ticks
 
     market_table = pa.table(market_data)
     pq.write_table(market_table, output_dir / "market_updates.parquet")
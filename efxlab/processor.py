@@ -2,7 +2,11 @@
 Event processor - orchestrates event handling with deterministic ordering.
 """
 
-from typing import List
+import logging
+from functools import partial
+from itertools import islice
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Tuple
 
 import structlog
 
@@ -25,21 +29,72 @@ from efxlab.handlers import (
     handle_hedge_order,
     handle_market_update,
 )
-from efxlab.state import EngineState
+from efxlab.state import DecimalStrCache, EngineState
 
 logger = structlog.get_logger()
 
+Handler = Callable[[EngineState, Any], Tuple[EngineState, List[OutputRecord]]]
+RecordSink = Callable[[List[OutputRecord]], None]
+
+# Event class -> handler, so dispatch is one dict lookup rather than an isinstance chain.
+# Read-only: each processor copies it and caches subclass lookups in its own copy.
+_HANDLERS: Mapping[type, Handler] = MappingProxyType(
+    {
+        ClientTradeEvent: handle_client_trade,
+        MarketUpdateEvent: handle_market_update,
+        ConfigUpdateEvent: handle_config_update,
+        HedgeOrderEvent: handle_hedge_order,
+        HedgeFillEvent: handle_hedge_fill,
+        ClockTickEvent: handle_clock_tick,
+    }
+)
+
 
 class EventProcessor:
     """
     Deterministic event processor.
 
     Processes events in strict order, maintaining state transitions.
+
+    Progress is logged every progress_every events (0 disables it). With a
+    record_sink, output records are handed to the sink in chunks of at
+    least flush_every records (and once more at the end of process_events)
+    instead of accumulating for the whole run; output_records then only holds
+    records not yet flushed, and the get_output_records* queries raise
+    RuntimeError rather than return a partial list.
     """
 
-    def __init__(self, initial_state: EngineState | None = None):
+    def __init__(
+        self,
+        initial_state: EngineState | None = None,
+        record_sink: RecordSink | None = None,
+        flush_every: int = 10000,
+        progress_every: int = 10000,
+    ):
+        if flush_every <= 0:
+            raise ValueError(f"flush_every must be positive, got {flush_every}")
+        if progress_every < 0:
+            raise ValueError(f"progress_every cannot be negative, got {progress_every}")
         self.state = initial_state or EngineState()
         self.output_records: List[OutputRecord] = []
+        self._record_sink = record_sink
+        self._flush_every = flush_every
+        self._flushed_count = 0
+        # Pending records bucketed by record_type; filled on query, not per event
+        self._records_by_type: Dict[str, List[OutputRecord]] = {}
+        self._indexed_records: List[OutputRecord] | None = None
+        self._indexed_count = 0
+        self._progress_every = progress_every
+        # Snapshot strings are cached per processor, never shared between runs;
+        # clock ticks render through it and so can the final state document
+        self.snapshot_strings = DecimalStrCache()
+        self._handlers: Dict[type, Handler] = {
+            **_HANDLERS,
+            ClockTickEvent: partial(handle_clock_tick, strings=self.snapshot_strings),
+        }
+        # Per-event debug fields are only built when they will be emitted;
+        # process_events re-checks the level at the start of every run
+        self._log_each_event = logger.is_enabled_for(logging.DEBUG)
 
     def process_event(self, event: BaseEvent) -> None:
         """
@@ -52,33 +107,25 @@ class EventProcessor:
             ValueError: If event type is unknown
         """
         try:
-            # Dispatch to appropriate handler
-            if isinstance(event, ClientTradeEvent):
-                new_state, outputs = handle_client_trade(self.state, event)
-            elif isinstance(event, MarketUpdateEvent):
-                new_state, outputs = handle_market_update(self.state, event)
-            elif isinstance(event, ConfigUpdateEvent):
-                new_state, outputs = handle_config_update(self.state, event)
-            elif isinstance(event, HedgeOrderEvent):
-                new_state, outputs = handle_hedge_order(self.state, event)
-            elif isinstance(event, HedgeFillEvent):
-                new_state, outputs = handle_hedge_fill(self.state, event)
-            elif isinstance(event, ClockTickEvent):
-                new_state, outputs = handle_clock_tick(self.state, event)
-            else:
-                raise ValueError(f"Unknown event type: {type(event)}")
+            # Dispatch to appropriate handler: exact-class hit first, then the MRO walk
+            event_class = type(event)
+            handler = self._handlers.get(event_class) or self._handler_for(event_class)
+            new_state, outputs = handler(self.state, event)
 
             # Update state
             self.state = new_state
             self.output_records.extend(outputs)
+            if self._record_sink is not None and len(self.output_records) >= self._flush_every:
+                self.flush_records()
 
             # Log progress
-            logger.debug(
-                "event_processed",
-                event_type=event.event_type.value,
-                timestamp=event.timestamp.isoformat(),
-                sequence_id=event.sequence_id,
-            )
+            if self._log_each_event:
+                logger.debug(
+                    "event_processed",
+                    event_type=event.event_type.value,
+                    timestamp=event.timestamp.isoformat(),
+                    sequence_id=event.sequence_id,
+                )
 
         except Exception as e:
             # Log error with full context
@@ -93,6 +140,17 @@ class EventProcessor:
             # Re-raise to fail fast (can be changed to graceful degradation)
             raise
 
+    def _handler_for(self, event_class: type) -> Handler:
+        """Look up the handler for an event class, falling back to its base classes."""
+        handlers = self._handlers
+        for base_class in event_class.__mro__[1:]:
+            handler = handlers.get(base_class)
+            if handler is not None:
+                # Remember subclasses so the walk happens once per class and processor
+                handlers[event_class] = handler
+                return handler
+        raise ValueError(f"Unknown event type: {event_class}")
+
     def process_events(self, events: List[BaseEvent]) -> EngineState:
         """
         Process a list of events in order.
@@ -107,32 +165,82 @@ class EventProcessor:
             Final engine state
         """
         logger.info("processing_started", event_count=len(events))
-
-        for i, event in enumerate(events):
-            self.process_event(event)
-
-            # Log progress periodically
-            if (i + 1) % 10000 == 0:
-                logger.info(
-                    "processing_progress",
-                    processed=i + 1,
-                    total=len(events),
-                    percent=round(100 * (i + 1) / len(events), 1),
-                )
+        self._log_each_event = logger.is_enabled_for(logging.DEBUG)
+
+        process_event = self.process_event
+        progress_every = self._progress_every
+        if not progress_every:
+            for event in events:
+                process_event(event)
+        else:
+            total = len(events)
+            percent_per_event = 100 / max(total, 1)
+            for processed, event in enumerate(events, 1):
+                process_event(event)
+
+                # Log progress periodically
+                if processed % progress_every == 0:
+                    logger.info(
+                        "processing_progress",
+                        processed=processed,
+                        total=total,
+                        percent=round(processed * percent_per_event, 1),
+                    )
+
+        self.flush_records()
 
         logger.info(
             "processing_completed",
             event_count=len(events),
             final_event_count=self.state.event_count,
-            output_records=len(self.output_records),
+            output_records=self._flushed_count + len(self.output_records),
         )
 
         return self.state
 
+    def flush_records(self) -> None:
+        """Hand pending output records to the record sink, if one is set."""
+        if self._record_sink is not None and self.output_records:
+            self._record_sink(self.output_records)
+            self._flushed_count += len(self.output_records)
+            self.output_records = []
+
     def get_output_records(self) -> List[OutputRecord]:
         """Get all output records generated during processing."""
+        self._check_records_kept()
         return self.output_records
 
+    def get_output_records_by_type(self, record_type: str) -> List[OutputRecord]:
+        """
+        Get pending output records of one record_type, in emission order.
+
+        Records are bucketed on query rather than as they are emitted, so event
+        processing pays nothing for the index; each record is bucketed once
+        and repeated queries only look at records emitted since the last one.
+        """
+        self._check_records_kept()
+        records = self.output_records
+        if records is not self._indexed_records:
+            # Flushed (or replaced) since the last query: start a fresh index
+            self._records_by_type = {}
+            self._indexed_records = records
+            self._indexed_count = 0
+        by_type = self._records_by_type
+        for record in islice(records, self._indexed_count, None):
+            bucket = by_type.get(record.record_type)
+            if bucket is None:
+                bucket = by_type[record.record_type] = []
+            bucket.append(record)
+        self._indexed_count = len(records)
+        return list(by_type.get(record_type, ()))
+
+    def _check_records_kept(self) -> None:
+        """Refuse record queries when records are handed to a sink instead of kept."""
+        if self._record_sink is not None:
+            raise RuntimeError(
+                "Output records are streamed to the record sink; read them from the sink"
+            )
+
     def get_state(self) -> EngineState:
         """Get current state."""
         return self.state
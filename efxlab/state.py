@@ -4,25 +4,105 @@ State model for the simulation engine.
 Maintains all simulation state with proper accounting primitives.
 """
 
-from dataclasses import dataclass, field, replace
+from dataclasses import dataclass, field
+from datetime import datetime
 from decimal import Decimal
-from typing import Dict, TYPE_CHECKING
+from typing import Any, Dict, Final, Mapping, Tuple, TYPE_CHECKING
 
-from efxlab.events import Side
+from efxlab.events import Side, split_pair
 
 if TYPE_CHECKING:
+    from efxlab.converter import CurrencyConverter
     from efxlab.lot_manager import LotManager
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MarketRate:
     """Market rates for a currency pair."""
 
     bid: Decimal
     ask: Decimal
     mid: Decimal
+    _inverse_mid: Decimal | None = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def inverse_mid(self) -> Decimal:
+        """1 / mid, computed on first use and kept for the life of the rate."""
+        inverse = self._inverse_mid
+        if inverse is None:
+            inverse = _ONE / self.mid
+            object.__setattr__(self, "_inverse_mid", inverse)
+        return inverse
+
+
+# Default for missing balances and positions, and the numerator for inverse rates
+_ZERO: Final[Decimal] = Decimal("0")
+_ONE: Final[Decimal] = Decimal("1")
+
+# Config event keys that map directly onto an EngineState field of the same name;
+# add a field here to make it settable through update_config
+_CONFIG_FIELDS: Final[frozenset[str]] = frozenset({"reporting_currency"})
+
+# {from_currency: {to_currency: (rate, is_inverse)}}
+RateIndex = Dict[str, Dict[str, Tuple[MarketRate, bool]]]
+
+
+def _index_rate(index: RateIndex, currency_pair: str, rate: MarketRate) -> None:
+    """
+    Record a pair's rate under both conversion directions.
 
+    Copies only the two inner dicts it touches so earlier states sharing
+    the index are unaffected. A directly quoted pair always wins over the
+    inverse of its mirror pair, matching the converter's lookup order.
+    """
+    try:
+        base_ccy, quote_ccy = split_pair(currency_pair)
+    except ValueError:
+        return  # Malformed pairs are never reachable by currency lookup
+
+    base_quotes = dict(index.get(base_ccy, {}))
+    base_quotes[quote_ccy] = (rate, False)
+    index[base_ccy] = base_quotes
+
+    quote_quotes = dict(index.get(quote_ccy, {}))
+    existing = quote_quotes.get(base_ccy)
+    if existing is None or existing[1]:
+        quote_quotes[base_ccy] = (rate, True)
+    index[quote_ccy] = quote_quotes
+
+
+class DecimalStrCache:
+    """
+    Memoizes str() of Decimal values across repeated snapshots.
+
+    State updates copy dict references, so a balance that has not moved keeps
+    the same Decimal object from one state to the next; object identity is a
+    safe change signal. Each entry holds its Decimal so the id cannot be
+    recycled by a different value. Size is bounded by the number of keys.
+
+    A cache belongs to one run (EventProcessor owns one); nothing is shared
+    between processors.
+    """
 
+    def __init__(self) -> None:
+        self._entries: Dict[Tuple[str, str], Tuple[Decimal, str]] = {}
+
+    def render(self, section: str, values: Mapping[str, Decimal]) -> Dict[str, str]:
+        """Return {key: str(value)}, reusing strings for unchanged values."""
+        entries = self._entries
+        rendered: Dict[str, str] = {}
+        for key, value in values.items():
+            cache_key = (section, key)
+            cached = entries.get(cache_key)
+            if cached is None or cached[0] is not value:
+                cached = (value, str(value))
+                entries[cache_key] = cached
+            rendered[key] = cached[1]
+        return rendered
+
+
+# Not slotted: _clone_with copies the instance __dict__ in one update, which is
+# cheaper per event than setting each slot, and states are built once per event
 @dataclass(frozen=True)
 class EngineState:
     """
@@ -43,6 +123,9 @@ class EngineState:
     Exposures: computed on-demand from positions
 
     Market cache: latest rates for each pair (for conversions and P&L)
+
+    Rate index: market cache keyed by currency in both directions, so the
+    converter resolves any from/to pair with a single lookup
     """
 
     # Core accounting state
@@ -57,18 +140,73 @@ class EngineState:
 
     # Configuration
     reporting_currency: str = "USD"
+    log_market_updates: bool = True  # Emit a market_update record per tick
 
-    # Event tracking
-    last_timestamp: str = ""
+    # Event tracking (timestamp is only formatted when serialized)
+    last_timestamp: datetime | None = None
     event_count: int = 0
 
+    # Derived from market_rates (never passed in, so it cannot go stale);
+    # maintained by update_market_rate
+    rate_index: RateIndex = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    # Built on first use; carried across updates that leave rates and config alone
+    _converter: "CurrencyConverter | None" = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    # compute_exposures result; carried across updates that leave positions and rates alone
+    _exposures: Dict[str, Decimal] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        # Constructed states (including dataclasses.replace) derive the index from
+        # market_rates; _clone_with skips __init__ and carries a maintained index
+        if self.market_rates:
+            index: RateIndex = {}
+            for pair, rate in self.market_rates.items():
+                _index_rate(index, pair, rate)
+            object.__setattr__(self, "rate_index", index)
+
+    @property
+    def converter(self) -> "CurrencyConverter":
+        """Currency converter over this state's market rates."""
+        converter = self._converter
+        if converter is None:
+            from efxlab.converter import CurrencyConverter
+
+            converter = CurrencyConverter(self)
+            object.__setattr__(self, "_converter", converter)
+        return converter
+
+    def _clone_with(self, **changes: Any) -> "EngineState":
+        """
+        Copy of this state with fields changed, without replace().
+
+        The source is already a valid state, so __init__/__post_init__ and the
+        fields() walk are skipped: the instance dict is copied and the changes
+        written over it (the frozen guard only covers __setattr__). Derived
+        caches are dropped when the fields they are built from change.
+        """
+        new_state = object.__new__(type(self))
+        values = new_state.__dict__
+        values.update(self.__dict__)
+        values.update(changes)
+        if "market_rates" in changes or "reporting_currency" in changes:
+            values["_converter"] = None
+            values["_exposures"] = None
+        elif "positions" in changes:
+            values["_exposures"] = None
+        return new_state
+
     def get_cash_balance(self, currency: str) -> Decimal:
         """Get cash balance for a currency, defaulting to zero."""
-        return self.cash_balances.get(currency, Decimal("0"))
+        return self.cash_balances.get(currency, _ZERO)
 
     def get_position(self, currency_pair: str) -> Decimal:
         """Get position for a currency pair, defaulting to zero."""
-        return self.positions.get(currency_pair, Decimal("0"))
+        return self.positions.get(currency_pair, _ZERO)
 
     def get_market_rate(self, currency_pair: str) -> MarketRate | None:
         """Get market rate for a currency pair."""
@@ -78,32 +216,78 @@ class EngineState:
         """Return new state with updated cash balance."""
         new_balances = dict(self.cash_balances)
         new_balances[currency] = self.get_cash_balance(currency) + delta
-        return replace(self, cash_balances=new_balances)
+        return self._clone_with(cash_balances=new_balances)
 
     def update_position(self, currency_pair: str, delta: Decimal) -> "EngineState":
         """Return new state with updated position."""
         new_positions = dict(self.positions)
         new_positions[currency_pair] = self.get_position(currency_pair) + delta
-        return replace(self, positions=new_positions)
+        return self._clone_with(positions=new_positions)
 
     def update_market_rate(
-        self, currency_pair: str, bid: Decimal, ask: Decimal, mid: Decimal
+        self,
+        currency_pair: str,
+        bid: Decimal,
+        ask: Decimal,
+        mid: Decimal,
+        *,
+        timestamp: datetime | None = None,
     ) -> "EngineState":
-        """Return new state with updated market rate."""
+        """
+        Return new state with updated market rate.
+
+        When timestamp is given, the event count and last timestamp are bumped
+        in the same copy (as increment_event_count would).
+        """
+        rate = MarketRate(bid=bid, ask=ask, mid=mid)
         new_rates = dict(self.market_rates)
-        new_rates[currency_pair] = MarketRate(bid=bid, ask=ask, mid=mid)
-        return replace(self, market_rates=new_rates)
-
-    def update_config(self, key: str, value: str) -> "EngineState":
-        """Return new state with updated configuration."""
-        if key == "reporting_currency":
-            return replace(self, reporting_currency=value)
-        # Add more config options as needed
-        return self
+        new_rates[currency_pair] = rate
+        new_index = dict(self.rate_index)
+        _index_rate(new_index, currency_pair, rate)
+        if timestamp is None:
+            new_state = self._clone_with(market_rates=new_rates, rate_index=new_index)
+        else:
+            new_state = self._clone_with(
+                market_rates=new_rates,
+                rate_index=new_index,
+                event_count=self.event_count + 1,
+                last_timestamp=timestamp,
+            )
+        # Exposures only read the rates of pairs with an open position, so a tick
+        # on any other pair leaves the memoized exposures valid
+        if not self.positions.get(currency_pair):
+            new_state.__dict__["_exposures"] = self._exposures
+        return new_state
+
+    def update_config(
+        self, key: str, value: str, *, timestamp: datetime | None = None
+    ) -> "EngineState":
+        """
+        Return new state with updated configuration.
 
-    def increment_event_count(self, timestamp: str) -> "EngineState":
+        When timestamp is given, the event count and last timestamp are bumped
+        in the same copy (as increment_event_count would).
+        """
+        if key in _CONFIG_FIELDS:
+            if timestamp is None:
+                return self._clone_with(**{key: value})
+            return self._clone_with(
+                **{key: value},
+                event_count=self.event_count + 1,
+                last_timestamp=timestamp,
+            )
+        # Unknown keys are ignored (the event is still counted)
+        if timestamp is None:
+            return self
+        return self.increment_event_count(timestamp)
+
+    def batch(self) -> "StateBatch":
+        """Start a batch of cash/position updates that yields one new state."""
+        return StateBatch(self)
+
+    def increment_event_count(self, timestamp: datetime) -> "EngineState":
         """Return new state with incremented event count."""
-        return replace(self, event_count=self.event_count + 1, last_timestamp=timestamp)
+        return self._clone_with(event_count=self.event_count + 1, last_timestamp=timestamp)
 
     def compute_exposures(self) -> Dict[str, Decimal]:
         """
@@ -113,59 +297,216 @@ class EngineState:
         - Positive position = long base (EUR), short quote (USD)
         - Negative position = short base (EUR), long quote (USD)
 
-        Returns: {currency: net_exposure_amount}
+        Returns: {currency: net_exposure_amount} (a fresh dict; the result is
+        memoized per state and reused by states sharing positions and rates)
         """
+        exposures = self._exposures
+        if exposures is None:
+            exposures = self._compute_exposures()
+            object.__setattr__(self, "_exposures", exposures)
+        return dict(exposures)
+
+    def _compute_exposures(self) -> Dict[str, Decimal]:
+        """Accumulate exposures from positions and market rates (uncached)."""
         exposures: Dict[str, Decimal] = {}
+        # Bound once: the loop is a handful of dict lookups per pair
+        exposure_for = exposures.get
+        rate_for = self.market_rates.get
 
         for pair, position_notional in self.positions.items():
-            if position_notional == 0:
+            if not position_notional:
                 continue
 
             # Parse currency pair (e.g., "EUR/USD" -> base="EUR", quote="USD")
-            parts = pair.split("/")
-            if len(parts) != 2:
+            try:
+                base_ccy, quote_ccy = split_pair(pair)
+            except ValueError:
                 continue  # Skip malformed pairs
-            base_ccy, quote_ccy = parts
 
             # Add base currency exposure
-            exposures[base_ccy] = exposures.get(base_ccy, Decimal("0")) + position_notional
+            exposures[base_ccy] = exposure_for(base_ccy, _ZERO) + position_notional
 
             # Add quote currency exposure (opposite sign)
             # If position is +1M EUR/USD, we're +1M EUR and need quote equivalent
             # This is simplified; proper implementation would use current market rate
             # For now, just track that we have opposite quote exposure
-            rate = self.get_market_rate(pair)
+            rate = rate_for(pair)
             if rate:
-                quote_exposure = -position_notional * rate.mid
-                exposures[quote_ccy] = exposures.get(quote_ccy, Decimal("0")) + quote_exposure
+                # Subtracting the product equals adding its negation, one op fewer
+                exposures[quote_ccy] = exposure_for(quote_ccy, _ZERO) - position_notional * rate.mid
 
         return exposures
 
-    def to_dict(self) -> Dict:
-        """Convert state to dictionary for serialization."""
-        result = {
-            "cash_balances": {k: str(v) for k, v in self.cash_balances.items()},
-            "positions": {k: str(v) for k, v in self.positions.items()},
-            "exposures": {k: str(v) for k, v in self.compute_exposures().items()},
-            "market_rates": {
+    def to_dict(
+        self,
+        *,
+        include_exposures: bool = True,
+        include_rates: bool = True,
+        strings: DecimalStrCache | None = None,
+    ) -> Dict:
+        """
+        Convert state to dictionary for serialization.
+
+        Exposures and market rates are the derived/bulky sections; callers that
+        do not need them (debugging, quick dumps) can leave them out. The
+        defaults produce the full final-state document. Passing the run's
+        strings cache reuses the strings of its last snapshot for unmoved values.
+        """
+        render = (strings or DecimalStrCache()).render
+        result: Dict[str, Any] = {
+            "cash_balances": render("cash_balances", self.cash_balances),
+            "positions": render("positions", self.positions),
+        }
+        if include_exposures:
+            result["exposures"] = render("exposures", self.compute_exposures())
+        if include_rates:
+            result["market_rates"] = {
                 k: {"bid": str(v.bid), "ask": str(v.ask), "mid": str(v.mid)}
                 for k, v in self.market_rates.items()
-            },
-            "reporting_currency": self.reporting_currency,
-            "last_timestamp": self.last_timestamp,
-            "event_count": self.event_count,
-        }
+            }
+        result["reporting_currency"] = self.reporting_currency
+        result["last_timestamp"] = self.last_timestamp.isoformat() if self.last_timestamp else ""
+        result["event_count"] = self.event_count
         if self.lot_manager:
             result["lot_tracking"] = self.lot_manager.to_dict()
         return result
 
 
+class StateBatch:
+    """
+    Accumulates cash and position updates against an EngineState.
+
+    Each book is copied at most once, on its first update, and finalize()
+    returns a single new state; the source state is never modified. Use it
+    where several update_cash/update_position/apply_trade calls would
+    otherwise each copy a dict and rebuild the state.
+    """
+
+    def __init__(self, state: EngineState):
+        self._state = state
+        self._cash_balances: Dict[str, Decimal] | None = None
+        self._positions: Dict[str, Decimal] | None = None
+        self._timestamp: datetime | None = None
+
+    def add_cash(self, currency: str, delta: Decimal) -> "StateBatch":
+        """Add delta to a currency's cash balance."""
+        if self._cash_balances is None:
+            self._cash_balances = dict(self._state.cash_balances)
+        self._cash_balances[currency] = self._cash_balances.get(currency, _ZERO) + delta
+        return self
+
+    def add_position(self, currency_pair: str, delta: Decimal) -> "StateBatch":
+        """Add delta to a currency pair's position."""
+        if self._positions is None:
+            self._positions = dict(self._state.positions)
+        self._positions[currency_pair] = self._positions.get(currency_pair, _ZERO) + delta
+        return self
+
+    def add_trade(
+        self,
+        currency_pair: str,
+        side: Side,
+        notional: Decimal,
+        price: Decimal,
+        quote_amount: Decimal | None = None,
+        *,
+        quote_cash_delta: Decimal | None = None,
+        currencies: Tuple[str, str] | None = None,
+    ) -> "StateBatch":
+        """
+        Add a trade's cash and position changes (as apply_trade).
+
+        Both paths book through _book_trade, so folding several trades into
+        one batch gives the same balances as applying them one at a time.
+        """
+        if self._cash_balances is None:
+            self._cash_balances = dict(self._state.cash_balances)
+        if self._positions is None:
+            self._positions = dict(self._state.positions)
+        _book_trade(
+            self._cash_balances,
+            self._positions,
+            currency_pair,
+            side,
+            notional,
+            price,
+            quote_amount,
+            quote_cash_delta,
+            currencies,
+        )
+        return self
+
+    def count_event(self, timestamp: datetime) -> "StateBatch":
+        """Count one processed event (as increment_event_count)."""
+        self._timestamp = timestamp
+        return self
+
+    def finalize(self) -> EngineState:
+        """Return the new state with all batched updates applied."""
+        changes: Dict[str, Any] = {}
+        if self._cash_balances is not None:
+            changes["cash_balances"] = self._cash_balances
+        if self._positions is not None:
+            changes["positions"] = self._positions
+        if self._timestamp is not None:
+            changes["event_count"] = self._state.event_count + 1
+            changes["last_timestamp"] = self._timestamp
+        if changes:
+            # Later updates start from the new state and copy its books afresh,
+            # so the returned state is never modified through this batch
+            self._state = self._state._clone_with(**changes)
+            self._cash_balances = self._positions = self._timestamp = None
+        return self._state
+
+
+def _book_trade(
+    cash_balances: Dict[str, Decimal],
+    positions: Dict[str, Decimal],
+    currency_pair: str,
+    side: Side,
+    notional: Decimal,
+    price: Decimal,
+    quote_amount: Decimal | None,
+    quote_cash_delta: Decimal | None,
+    currencies: Tuple[str, str] | None,
+) -> None:
+    """
+    Book a trade's cash and position changes into the given (already copied) books.
+
+    The single implementation of trade accounting, shared by apply_trade and
+    StateBatch.add_trade. See apply_trade for the desk-perspective signs.
+    """
+    base_ccy, quote_ccy = currencies or split_pair(currency_pair)
+    if quote_amount is None:
+        quote_amount = notional * price
+
+    # Base cash and position always move together; only the sign depends on side,
+    # so one signed delta serves both (one negation per trade, no multiplies)
+    if side is Side.BUY:
+        # Client buys base from desk: desk loses base, gains quote
+        base_delta, quote_delta = -notional, quote_amount
+    else:  # Side.SELL
+        # Client sells base to desk: desk gains base, loses quote
+        base_delta, quote_delta = notional, -quote_amount
+
+    cash_balances[base_ccy] = cash_balances.get(base_ccy, _ZERO) + base_delta
+    cash_balances[quote_ccy] = cash_balances.get(quote_ccy, _ZERO) + quote_delta
+    if quote_cash_delta is not None:
+        cash_balances[quote_ccy] += quote_cash_delta
+    positions[currency_pair] = positions.get(currency_pair, _ZERO) + base_delta
+
+
 def apply_trade(
     state: EngineState,
     currency_pair: str,
     side: Side,
     notional: Decimal,
     price: Decimal,
+    quote_amount: Decimal | None = None,
+    *,
+    quote_cash_delta: Decimal | None = None,
+    timestamp: datetime | None = None,
+    currencies: Tuple[str, str] | None = None,
 ) -> EngineState:
     """
     Apply a trade to state (client or hedge).
@@ -180,22 +521,36 @@ def apply_trade(
         side: BUY or SELL (client side)
         notional: Amount in base currency
         price: Quote per unit base
+        quote_amount: notional * price, if the caller already has it
+        quote_cash_delta: Further quote currency cash change (e.g., slippage cost)
+        timestamp: If given, the trade's event is also counted (as
+            increment_event_count) in the same state copy
+        currencies: (base, quote) of currency_pair, if the caller already has
+            them (events derive them at construction)
 
     Returns:
         New state with updated cash and positions
     """
-    base_ccy, quote_ccy = currency_pair.split("/")
-    quote_amount = notional * price
-
-    if side == Side.BUY:
-        # Client buys base from desk: desk loses base, gains quote
-        state = state.update_cash(base_ccy, -notional)
-        state = state.update_cash(quote_ccy, quote_amount)
-        state = state.update_position(currency_pair, -notional)
-    else:  # Side.SELL
-        # Client sells base to desk: desk gains base, loses quote
-        state = state.update_cash(base_ccy, notional)
-        state = state.update_cash(quote_ccy, -quote_amount)
-        state = state.update_position(currency_pair, notional)
-
-    return state
+    # One copy of each book and one new state, rather than a state per update
+    cash_balances = dict(state.cash_balances)
+    positions = dict(state.positions)
+    _book_trade(
+        cash_balances,
+        positions,
+        currency_pair,
+        side,
+        notional,
+        price,
+        quote_amount,
+        quote_cash_delta,
+        currencies,
+    )
+
+    if timestamp is None:
+        return state._clone_with(cash_balances=cash_balances, positions=positions)
+    return state._clone_with(
+        cash_balances=cash_balances,
+        positions=positions,
+        event_count=state.event_count + 1,
+        last_timestamp=timestamp,
+    )
@@ -2,12 +2,13 @@
 Unit tests for currency converter.
 """
 
+from dataclasses import replace
 from decimal import Decimal
 
 import pytest
 
 from efxlab.converter import ConversionError, CurrencyConverter
-from efxlab.state import EngineState
+from efxlab.state import EngineState, MarketRate
 
 
 def test_same_currency_conversion():
@@ -122,3 +123,87 @@ def test_get_rate():
     # Same currency
     rate = converter.get_rate("USD", "USD")
     assert rate == Decimal("1")
+
+
+def test_direct_pair_preferred_over_mirror():
+    """Test that a directly quoted pair wins over the inverse of its mirror."""
+    state = EngineState()
+    state = state.update_market_rate(
+        "EUR/USD",
+        bid=Decimal("1.0995"),
+        ask=Decimal("1.1005"),
+        mid=Decimal("1.1000"),
+    )
+    state = state.update_market_rate(
+        "USD/EUR",
+        bid=Decimal("0.9000"),
+        ask=Decimal("0.9200"),
+        mid=Decimal("0.9100"),
+    )
+
+    converter = CurrencyConverter(state)
+
+    assert converter.get_rate("EUR", "USD") == Decimal("1.1000")
+    assert converter.get_rate("USD", "EUR") == Decimal("0.9100")
+
+
+def test_sum_to_reporting():
+    """Test summing multi-currency amounts, skipping currencies without a rate."""
+    state = EngineState(reporting_currency="USD")
+    state = state.update_market_rate(
+        "EUR/USD",
+        bid=Decimal("1.0995"),
+        ask=Decimal("1.1005"),
+        mid=Decimal("1.1000"),
+    )
+
+    converter = CurrencyConverter(state)
+
+    total = converter.sum_to_reporting(
+        {"USD": Decimal("500"), "EUR": Decimal("1000"), "CHF": Decimal("250")}
+    )
+    assert total == Decimal("1600")  # 500 + 1000 * 1.1, CHF has no rate
+
+
+def test_state_converter_reused_until_rates_change():
+    """Test the state's converter survives cash updates but not rate updates."""
+    state = EngineState(reporting_currency="USD")
+    state = state.update_market_rate(
+        "EUR/USD",
+        bid=Decimal("1.0995"),
+        ask=Decimal("1.1005"),
+        mid=Decimal("1.1000"),
+    )
+    converter = state.converter
+    assert converter.convert_to_reporting(Decimal("1000"), "EUR") == Decimal("1100")
+
+    state = state.update_cash("EUR", Decimal("1000"))
+    assert state.converter is converter
+    assert state.converter.sum_to_reporting(state.cash_balances) == Decimal("1100")
+    assert state.converter.sum_to_reporting(state.cash_balances) == Decimal("1100")
+
+    state = state.update_cash("USD", Decimal("50"))
+    assert state.converter.sum_to_reporting(state.cash_balances) == Decimal("1150")
+
+    state = state.update_market_rate(
+        "EUR/USD",
+        bid=Decimal("1.1995"),
+        ask=Decimal("1.2005"),
+        mid=Decimal("1.2000"),
+    )
+    assert state.converter is not converter
+    assert state.converter.convert_to_reporting(Decimal("1000"), "EUR") == Decimal("1200")
+
+
+def test_replaced_rates_rebuild_rate_index():
+    """States built via dataclasses.replace convert at their own rates."""
+    state = EngineState().update_market_rate(
+        "EUR/USD", Decimal("1.0995"), Decimal("1.1005"), Decimal("1.1000")
+    )
+    replaced = replace(
+        state,
+        market_rates={"EUR/USD": MarketRate(Decimal("1.9995"), Decimal("2.0005"), Decimal("2.0"))},
+    )
+
+    assert replaced.converter.convert(Decimal("100"), "EUR", "USD") == Decimal("200.0")
+    assert state.converter.convert(Decimal("100"), "EUR", "USD") == Decimal("110.0000")
@@ -7,6 +7,7 @@ from decimal import Decimal
 
 import pytest
 
+from efxlab import events
 from efxlab.events import (
     ClientTradeEvent,
     ClockTickEvent,
@@ -16,6 +17,7 @@ from efxlab.events import (
     HedgeOrderEvent,
     MarketUpdateEvent,
     Side,
+    split_pair,
 )
 
 
@@ -35,6 +37,10 @@ def test_client_trade_event_creation():
     assert event.notional == Decimal("1000000")
     assert event.price == Decimal("1.1000")
     assert event.side == Side.BUY
+    assert event.base_ccy == "EUR"
+    assert event.quote_ccy == "USD"
+    assert event.quote_amount == Decimal("1100000.0000")
+    assert not hasattr(event, "__dict__")
 
 
 def test_client_trade_event_validation():
@@ -128,6 +134,11 @@ def test_event_ordering():
         tick_label="T3",
     )
 
+    assert event1 < event2 < event3
+    assert event3 > event1
+    assert event1 <= event1 <= event2
+    assert event3 >= event2 >= event2
+
     events = [event3, event1, event2]
     events.sort()
 
@@ -177,3 +188,40 @@ def test_hedge_order_and_fill():
     )
     assert fill.order_id == order.order_id
     assert fill.slippage == Decimal("250")
+    assert fill.quote_ccy == "USD"
+    assert fill.slippage_cash_delta == Decimal("-250")
+
+
+def test_side_opposite():
+    """Test each side maps to its counterparty side."""
+    assert Side.BUY.opposite is Side.SELL
+    assert Side.SELL.opposite is Side.BUY
+    assert Side("BUY").opposite.value == "SELL"
+
+
+def test_validation_can_be_disabled(monkeypatch):
+    """Test trusted-feed mode skips field checks but still derives fields."""
+    monkeypatch.setattr(events, "VALIDATE_EVENTS", False)
+    event = ClientTradeEvent(
+        timestamp=datetime(2025, 1, 1, 10, 0, 0, tzinfo=timezone.utc),
+        sequence_id=1,
+        event_type=EventType.CLIENT_TRADE,
+        currency_pair="EUR/USD",
+        side=Side.BUY,
+        notional=Decimal("-1"),
+        price=Decimal("1.1000"),
+        client_id="CLIENT_001",
+        trade_id="TRADE_001",
+    )
+    assert event.notional == Decimal("-1")
+    assert event.base_ccy == "EUR"
+
+
+def test_split_pair():
+    """Test pair splitting returns interned codes and rejects malformed pairs."""
+    base, quote = split_pair("EUR/USD")
+    assert (base, quote) == ("EUR", "USD")
+    assert split_pair("EUR/USD")[0] is base
+
+    with pytest.raises(ValueError):
+        split_pair("EURUSD")
@@ -18,6 +18,7 @@ from efxlab.events import (
     Side,
 )
 from efxlab.handlers import (
+    OutputRecord,
     handle_client_trade,
     handle_clock_tick,
     handle_config_update,
@@ -56,6 +57,24 @@ def test_handle_client_trade():
     assert outputs[0].record_type == "client_trade"
     assert outputs[0].data["trade_id"] == "TRADE_001"
 
+    # Raw values are kept; sinks write them rendered as strings
+    assert outputs[0].data["notional"] == Decimal("1000000")
+    rendered = outputs[0].rendered_data()
+    assert rendered["notional"] == "1000000"
+    assert rendered["side"] == "BUY"
+    assert rendered["quote_amount"] == "1100000.0000"
+
+
+def test_output_record_renders_nested_values():
+    """Test rendering reaches Decimals and enums inside nested dicts and lists."""
+    record = OutputRecord(
+        timestamp=datetime(2025, 1, 1, 10, 0, 0, tzinfo=timezone.utc),
+        record_type="note",
+        data={"amounts": {"EUR": Decimal("5")}, "sides": [Side.BUY], "count": 2},
+    )
+    assert record.rendered_data() == {"amounts": {"EUR": "5"}, "sides": ["BUY"], "count": 2}
+    assert record.data["amounts"]["EUR"] == Decimal("5")
+
 
 def test_handle_market_update():
     """Test market update handler."""
@@ -82,6 +101,13 @@ def test_handle_market_update():
     assert len(outputs) == 1
     assert outputs[0].record_type == "market_update"
 
+    # Rates still update when market update records are disabled
+    quiet_state = EngineState(log_market_updates=False)
+    new_state, outputs = handle_market_update(quiet_state, event)
+    assert new_state.get_market_rate("EUR/USD") is not None
+    assert new_state.event_count == 1
+    assert outputs == []
+
 
 def test_handle_config_update():
     """Test config update handler."""
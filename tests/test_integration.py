@@ -177,15 +177,13 @@ def test_complete_simulation_scenario():
     assert final_state.get_market_rate("GBP/USD") is not None
 
 
-def test_deterministic_rerun():
-    """
-    Test that running the same events twice produces identical results.
-
-    This is critical for reproducibility.
-    """
+@pytest.fixture(scope="module")
+def eur_usd_buy_events():
+    """Rate, one client buy and a snapshot tick; shared because events are immutable."""
     base_time = datetime(2025, 1, 1, 10, 0, 0, tzinfo=timezone.utc)
 
-    events = [
+    return [
+        # Set up market rates
         MarketUpdateEvent(
             timestamp=base_time,
             sequence_id=1,
@@ -195,6 +193,7 @@ def test_deterministic_rerun():
             ask=Decimal("1.1005"),
             mid=Decimal("1.1000"),
         ),
+        # Trade creates EUR/USD position
         ClientTradeEvent(
             timestamp=base_time + timedelta(seconds=1),
             sequence_id=2,
@@ -206,6 +205,7 @@ def test_deterministic_rerun():
             client_id="CLIENT_001",
             trade_id="TRADE_001",
         ),
+        # Clock tick to calculate exposures
         ClockTickEvent(
             timestamp=base_time + timedelta(seconds=2),
             sequence_id=3,
@@ -214,6 +214,15 @@ def test_deterministic_rerun():
         ),
     ]
 
+
+def test_deterministic_rerun(eur_usd_buy_events):
+    """
+    Test that running the same events twice produces identical results.
+
+    This is critical for reproducibility.
+    """
+    events = eur_usd_buy_events
+
     # Run 1
     processor1 = EventProcessor(EngineState(reporting_currency="USD"))
     state1 = processor1.process_events(events)
@@ -239,41 +248,9 @@ def test_deterministic_rerun():
         assert r1.data == r2.data
 
 
-def test_exposure_calculation_integration():
+def test_exposure_calculation_integration(eur_usd_buy_events):
     """Test exposure calculation in realistic scenario."""
-    base_time = datetime(2025, 1, 1, 10, 0, 0, tzinfo=timezone.utc)
-
-    events = [
-        # Set up market rates
-        MarketUpdateEvent(
-            timestamp=base_time,
-            sequence_id=1,
-            event_type=EventType.MARKET_UPDATE,
-            currency_pair="EUR/USD",
-            bid=Decimal("1.0995"),
-            ask=Decimal("1.1005"),
-            mid=Decimal("1.1000"),
-        ),
-        # Trade creates EUR/USD position
-        ClientTradeEvent(
-            timestamp=base_time + timedelta(seconds=1),
-            sequence_id=2,
-            event_type=EventType.CLIENT_TRADE,
-            currency_pair="EUR/USD",
-            side=Side.BUY,
-            notional=Decimal("1000000"),
-            price=Decimal("1.1000"),
-            client_id="CLIENT_001",
-            trade_id="TRADE_001",
-        ),
-        # Clock tick to calculate exposures
-        ClockTickEvent(
-            timestamp=base_time + timedelta(seconds=2),
-            sequence_id=3,
-            event_type=EventType.CLOCK_TICK,
-            tick_label="SNAPSHOT",
-        ),
-    ]
+    events = eur_usd_buy_events
 
     processor = EventProcessor(EngineState(reporting_currency="USD"))
     final_state = processor.process_events(events)
@@ -288,7 +265,6 @@ def test_exposure_calculation_integration():
     assert exposures["USD"] == Decimal("1100000")
 
     # Verify clock tick output includes exposures
-    records = processor.get_output_records()
-    tick_record = [r for r in records if r.record_type == "clock_tick"][0]
+    tick_record = processor.get_output_records_by_type("clock_tick")[0]
     assert "exposures" in tick_record.data
     assert tick_record.data["exposures"]["EUR"] == "-1000000"
@@ -67,11 +67,10 @@ def test_lot_tracking_with_direct_pair():
     assert final_state.lot_manager.get_net_position("EUR/USD") == Decimal("-100000")
 
     # Verify output records
-    outputs = processor.get_output_records()
-    lot_created_records = [o for o in outputs if o.record_type == "lot_created"]
+    lot_created_records = processor.get_output_records_by_type("lot_created")
     assert len(lot_created_records) == 1
     assert lot_created_records[0].data["risk_pair"] == "EUR/USD"
-    assert lot_created_records[0].data["side"] == "SELL"  # Desk side
+    assert lot_created_records[0].data["side"] is Side.SELL  # Desk side
 
 
 def test_lot_tracking_with_cross_pair():
@@ -137,8 +136,7 @@ def test_lot_tracking_with_cross_pair():
     assert final_state.lot_manager.get_net_position("GBP/USD") == Decimal("85000")
 
     # Verify output records
-    outputs = processor.get_output_records()
-    lot_created_records = [o for o in outputs if o.record_type == "lot_created"]
+    lot_created_records = processor.get_output_records_by_type("lot_created")
     assert len(lot_created_records) == 2  # Two legs
 
 
@@ -217,8 +215,7 @@ def test_lot_matching_internalization():
     assert final_state.lot_manager.get_net_position("EUR/USD") == Decimal("0")
 
     # Verify lot was matched
-    outputs = processor.get_output_records()
-    lot_match_records = [o for o in outputs if o.record_type == "lot_match"]
+    lot_match_records = processor.get_output_records_by_type("lot_match")
     assert len(lot_match_records) == 1
 
     # Verify P&L from match
@@ -2,8 +2,10 @@
 Tests for lot tracking system (lot.py, lot_manager.py, decomposition.py).
 """
 
+from dataclasses import astuple, fields, replace
 from datetime import datetime, timezone
 from decimal import Decimal
+from types import MappingProxyType
 
 import pytest
 
@@ -14,86 +16,122 @@ from efxlab.lot import Lot, LotQueue
 from efxlab.lot_manager import LotConfig, LotManager
 from efxlab.state import EngineState, MarketRate
 
+# Timestamps most lots open and match at
+OPEN_TIME = datetime(2024, 1, 1, 10, 0, tzinfo=timezone.utc)
+CLOSE_TIME = datetime(2024, 1, 1, 11, 0, tzinfo=timezone.utc)
+
+# Quantities and prices most lots and matches use (Decimals are immutable, so shared)
+Q100K = Decimal("100000")
+Q75K = Decimal("75000")
+Q60K = Decimal("60000")
+Q50K = Decimal("50000")
+Q40K = Decimal("40000")
+PX_1_10 = Decimal("1.1000")
+PX_1_15 = Decimal("1.1500")
+PX_1_0995 = Decimal("1.0995")
+# Cross trade sizes, the EUR/GBP price they trade at and the GBP/USD mid
+Q1M = Decimal("1000000")
+Q500K = Decimal("500000")
+PX_0_85 = Decimal("0.8500")
+PX_1_2941 = Decimal("1.2941")
+
+# Shared Lot fields, built once at import and read-only; tests override what they exercise
+LOT_DEFAULTS = MappingProxyType(
+    {
+        "lot_id": "T001_EUR/USD",
+        "risk_pair": "EUR/USD",
+        "side": Side.BUY,
+        "quantity": Q100K,
+        "original_quantity": Q100K,
+        "trade_price": PX_1_10,
+        "open_timestamp": OPEN_TIME,
+        "originating_trade_id": "T001",
+        "decomposition_path": "EUR/USD",
+        "open_mid": PX_1_0995,
+    }
+)
+
+
+def make_lot(**overrides) -> Lot:
+    """Build a Lot from LOT_DEFAULTS with the given fields replaced."""
+    return Lot(**{**LOT_DEFAULTS, **overrides})
+
+
+def assert_queue(queue: LotQueue, *, net: str, open_count: int, closed_count: int = 0) -> None:
+    """Check a queue's net position and open/closed lot counts in one comparison."""
+    assert (queue.get_net_position(), len(queue.open_lots), len(queue.closed_lots)) == (
+        Decimal(net),
+        open_count,
+        closed_count,
+    )
+
 
 class TestLot:
     """Test Lot dataclass validation and operations."""
 
     def test_lot_creation(self):
         """Test creating a valid lot."""
-        lot = Lot(
-            lot_id="T001_EUR/USD",
-            risk_pair="EUR/USD",
-            side=Side.BUY,
-            quantity=Decimal("100000"),
-            original_quantity=Decimal("100000"),
-            trade_price=Decimal("1.1000"),
-            open_timestamp=datetime(2024, 1, 1, 10, 0, tzinfo=timezone.utc),
-            originating_trade_id="T001",
-            decomposition_path="EUR/USD",
-            open_mid=Decimal("1.0995"),
-            close_timestamp=None,
-            close_mid=None,
-        )
+        lot = make_lot(close_timestamp=None, close_mid=None)
         assert lot.lot_id == "T001_EUR/USD"
-        assert lot.quantity == Decimal("100000")
+        assert lot.quantity == Q100K
 
     def test_lot_validation_negative_quantity(self):
         """Test lot rejects negative quantity."""
         with pytest.raises(ValueError, match="cannot be negative"):
-            Lot(
-                lot_id="T001",
-                risk_pair="EUR/USD",
-                side=Side.BUY,
-                quantity=Decimal("-100000"),
-                original_quantity=Decimal("100000"),
-                trade_price=Decimal("1.1000"),
-                open_timestamp=datetime(2024, 1, 1, 10, 0, tzinfo=timezone.utc),
-                originating_trade_id="T001",
-                decomposition_path="EUR/USD",
-                open_mid=Decimal("1.0995"),
-                close_timestamp=None,
-                close_mid=None,
-            )
-
-    def test_lot_unrealized_pnl_buy(self):
-        """Test unrealized P&L calculation for BUY lot."""
-        lot = Lot(
-            lot_id="T001",
-            risk_pair="EUR/USD",
-            side=Side.BUY,
-            quantity=Decimal("100000"),
-            original_quantity=Decimal("100000"),
-            trade_price=Decimal("1.1000"),
-            open_timestamp=datetime(2024, 1, 1, 10, 0, tzinfo=timezone.utc),
-            originating_trade_id="T001",
-            decomposition_path="EUR/USD",
-            open_mid=Decimal("1.0995"),
-            close_timestamp=None,
-            close_mid=None,
-        )
-        # Buy @ 1.1000, mark @ 1.1500 -> gain +5000 USD (0.05 * 100k)
-        pnl = lot.get_unrealized_pnl(Decimal("1.1500"))
-        assert pnl == Decimal("5000")
-
-    def test_lot_unrealized_pnl_sell(self):
-        """Test unrealized P&L calculation for SELL lot."""
-        lot = Lot(
-            lot_id="T002",
-            risk_pair="EUR/USD",
-            side=Side.SELL,
-            quantity=Decimal("100000"),
-            original_quantity=Decimal("100000"),
-            trade_price=Decimal("1.1000"),
-            open_timestamp=datetime(2024, 1, 1, 10, 0, tzinfo=timezone.utc),
-            originating_trade_id="T002",
-            decomposition_path="EUR/USD",
-            open_mid=Decimal("1.1005"),
-            close_timestamp=None,
-            close_mid=None,
-        )
-        # Sell @ 1.1000, mark @ 1.0900 -> gain +1000 USD (0.01 * 100k)
-        pnl = lot.get_unrealized_pnl(Decimal("1.0900"))
-        assert pnl == Decimal("1000")
+            make_lot(quantity=Decimal("-100000"))
+
+    @pytest.mark.parametrize(
+        "side,mark,expected",
+        [
+            # Buy @ 1.1000, mark @ 1.1500 -> gain +5000 USD (0.05 * 100k)
+            (Side.BUY, "1.1500", "5000"),
+            # Sell @ 1.1000, mark @ 1.0900 -> gain +1000 USD (0.01 * 100k)
+            (Side.SELL, "1.0900", "1000"),
+        ],
+    )
+    def test_lot_unrealized_pnl(self, side, mark, expected):
+        """Test unrealized P&L calculation for BUY and SELL lots."""
+        lot = make_lot(side=side)
+        assert lot.get_unrealized_pnl(Decimal(mark)) == Decimal(expected)
+
+    def test_lot_direction(self):
+        """Test direction is derived from side and survives copies."""
+        lot = make_lot(side=Side.SELL)
+        assert lot.direction == Decimal("-1")
+        assert lot.reduce_quantity(Q40K).direction == Decimal("-1")
+        assert make_lot().direction == Decimal("1")
+
+    def test_lot_reduce_and_close_copies(self):
+        """Test reduce_quantity/close return updated copies and keep checks."""
+        lot = make_lot(lot_id="T003", originating_trade_id="T003")
+        reduced = lot.reduce_quantity(Q40K)
+        assert astuple(reduced) == astuple(replace(lot, quantity=Q60K))
+        assert lot.quantity == Q100K
+
+        closed = reduced.close(CLOSE_TIME, PX_1_15)
+        assert closed.is_closed
+        assert closed.close_mid == PX_1_15
+        assert closed.quantity == Q60K
+
+        with pytest.raises(ValueError, match="zero quantity"):
+            lot.reduce_quantity(Q100K)
+
+    def test_lot_copy_carries_every_field(self):
+        """Test _copy sets every Lot field, matching a validated construction."""
+        lot = make_lot(side=Side.SELL)
+        copied = lot._copy(Q40K, CLOSE_TIME, PX_1_15)
+        expected = replace(lot, quantity=Q40K, close_timestamp=CLOSE_TIME, close_mid=PX_1_15)
+        for lot_field in fields(Lot):
+            name = lot_field.name
+            assert getattr(copied, name) == getattr(expected, name), name
+
+    def test_lot_identity_semantics(self):
+        """Test lots compare and hash by identity, so they work as set members and dict keys."""
+        lot = make_lot()
+        assert lot == lot
+        assert lot != make_lot()
+        assert {lot: "open"}[lot] == "open"
+        assert len({lot, make_lot(), lot}) == 2
 
 
 class TestLotQueue:
@@ -102,272 +140,185 @@ class TestLotQueue:
     def test_empty_queue(self):
         """Test operations on empty queue."""
         queue = LotQueue("EUR/USD")
-        assert queue.get_net_position() == Decimal("0")
-        assert len(queue.open_lots) == 0
+        assert_queue(queue, net="0", open_count=0)
 
     def test_add_buy_lot(self):
         """Test adding a BUY lot."""
         queue = LotQueue("EUR/USD")
-        lot = Lot(
-            lot_id="T001",
-            risk_pair="EUR/USD",
-            side=Side.BUY,
-            quantity=Decimal("100000"),
-            original_quantity=Decimal("100000"),
-            trade_price=Decimal("1.1000"),
-            open_timestamp=datetime(2024, 1, 1, 10, 0, tzinfo=timezone.utc),
-            originating_trade_id="T001",
-            decomposition_path="EUR/USD",
-            open_mid=Decimal("1.0995"),
-            close_timestamp=None,
-            close_mid=None,
-        )
-        queue.add_lot(lot)
-        assert queue.get_net_position() == Decimal("100000")
-        assert len(queue.open_lots) == 1
+        queue.add_lot(make_lot(lot_id="T001"))
+        assert_queue(queue, net="100000", open_count=1)
 
     def test_add_sell_lot(self):
         """Test adding a SELL lot."""
         queue = LotQueue("EUR/USD")
-        lot = Lot(
-            lot_id="T002",
-            risk_pair="EUR/USD",
-            side=Side.SELL,
-            quantity=Decimal("50000"),
-            original_quantity=Decimal("50000"),
-            trade_price=Decimal("1.1000"),
-            open_timestamp=datetime(2024, 1, 1, 10, 0, tzinfo=timezone.utc),
-            originating_trade_id="T002",
-            decomposition_path="EUR/USD",
-            open_mid=Decimal("1.1005"),
-            close_timestamp=None,
-            close_mid=None,
+        queue.add_lot(
+            make_lot(
+                lot_id="T002",
+                side=Side.SELL,
+                quantity=Q50K,
+                original_quantity=Q50K,
+                originating_trade_id="T002",
+            )
         )
-        queue.add_lot(lot)
-        assert queue.get_net_position() == Decimal("-50000")
-        assert len(queue.open_lots) == 1
-
-    def test_full_fifo_match(self):
-        """Test full FIFO match closes entire lot."""
+        assert_queue(queue, net="-50000", open_count=1)
+
+    # BUY lots as (quantity, trade_price), matched by one SELL at 1.1500. Expected
+    # matches are (matched, remaining or None, realized P&L), then the queue state.
+    @pytest.mark.parametrize(
+        "lots, sell_quantity, expected_matches, net, open_count, closed_count",
+        [
+            # (1.1500 - 1.1000) * 100k = 5000; the lot closes and the queue empties
+            pytest.param(
+                [(Q100K, PX_1_10)],
+                Q100K,
+                [(Q100K, None, Decimal("5000"))],
+                "0",
+                0,
+                1,
+                id="full",
+            ),
+            # (1.1500 - 1.1000) * 40k = 2000; 60k stays open
+            pytest.param(
+                [(Q100K, PX_1_10)],
+                Q40K,
+                [(Q40K, Q60K, Decimal("2000"))],
+                "60000",
+                1,
+                0,
+                id="partial",
+            ),
+            # Closes the first lot (50k, P&L 2500) and takes 50k of the second
+            # ((1.1500 - 1.1100) * 50k = 2000), leaving 25k open
+            pytest.param(
+                [(Q50K, PX_1_10), (Q75K, Decimal("1.1100"))],
+                Q100K,
+                [(Q50K, None, Decimal("2500")), (Q50K, Decimal("25000"), Decimal("2000"))],
+                "25000",
+                1,
+                1,
+                id="multi_lot",
+            ),
+        ],
+    )
+    def test_fifo_match(self, lots, sell_quantity, expected_matches, net, open_count, closed_count):
+        """Test FIFO matching closes, reduces and spans lots in arrival order."""
         queue = LotQueue("EUR/USD")
+        for number, (quantity, price) in enumerate(lots, 1):
+            trade_id = f"T00{number}"
+            queue.add_lot(
+                make_lot(
+                    lot_id=trade_id,
+                    originating_trade_id=trade_id,
+                    quantity=quantity,
+                    original_quantity=quantity,
+                    trade_price=price,
+                )
+            )
 
-        # Add BUY lot
-        buy_lot = Lot(
-            lot_id="T001",
-            risk_pair="EUR/USD",
-            side=Side.BUY,
-            quantity=Decimal("100000"),
-            original_quantity=Decimal("100000"),
-            trade_price=Decimal("1.1000"),
-            open_timestamp=datetime(2024, 1, 1, 10, 0, tzinfo=timezone.utc),
-            originating_trade_id="T001",
-            decomposition_path="EUR/USD",
-            open_mid=Decimal("1.0995"),
-            close_timestamp=None,
-            close_mid=None,
-        )
-        queue.add_lot(buy_lot)
+        matches = queue.match(sell_quantity, Side.SELL, PX_1_15, CLOSE_TIME)
 
-        # Match with SELL (closes BUY)
-        matches = queue.match(
-            Decimal("100000"),
-            Side.SELL,
-            Decimal("1.1500"),
-            datetime(2024, 1, 1, 11, 0, tzinfo=timezone.utc),
-        )
+        assert [
+            (
+                match.matched_quantity,
+                match.remaining_lot.quantity if match.remaining_lot else None,
+                match.realized_pnl,
+            )
+            for match in matches
+        ] == expected_matches
+        assert_queue(queue, net=net, open_count=open_count, closed_count=closed_count)
 
-        assert len(matches) == 1
-        match = matches[0]
-        assert match.matched_quantity == Decimal("100000")
-        assert match.remaining_lot is None  # Fully closed
-        assert match.realized_pnl == Decimal("5000")  # (1.1500 - 1.1000) * 100k = 5000
-
-        # Queue should be empty
-        assert queue.get_net_position() == Decimal("0")
-        assert len(queue.open_lots) == 0
-        assert len(queue.closed_lots) == 1
-
-    def test_partial_fifo_match(self):
-        """Test partial FIFO match reduces lot quantity."""
+    def test_net_position_tracks_lots_added_after_match(self):
+        """Test the cached net position keeps tracking lots added after a match."""
         queue = LotQueue("EUR/USD")
+        queue.add_lot(make_lot(lot_id="T001"))
+        queue.match(Q40K, Side.SELL, PX_1_15, CLOSE_TIME)
+        assert queue.open_lots[0].quantity == Q60K
 
-        # Add BUY lot
-        buy_lot = Lot(
-            lot_id="T001",
-            risk_pair="EUR/USD",
-            side=Side.BUY,
-            quantity=Decimal("100000"),
-            original_quantity=Decimal("100000"),
-            trade_price=Decimal("1.1000"),
-            open_timestamp=datetime(2024, 1, 1, 10, 0, tzinfo=timezone.utc),
-            originating_trade_id="T001",
-            decomposition_path="EUR/USD",
-            open_mid=Decimal("1.0995"),
-            close_timestamp=None,
-            close_mid=None,
-        )
-        queue.add_lot(buy_lot)
-
-        # Match with SELL of smaller amount
-        matches = queue.match(
-            Decimal("40000"),
-            Side.SELL,
-            Decimal("1.1500"),
-            datetime(2024, 1, 1, 11, 0, tzinfo=timezone.utc),
-        )
+        queue.add_lot(make_lot(lot_id="T003", originating_trade_id="T003"))
+        assert queue.get_net_position() == Decimal("160000")
 
-        assert len(matches) == 1
-        match = matches[0]
-        assert match.matched_quantity == Decimal("40000")
-        assert match.remaining_lot is not None
-        assert match.remaining_lot.quantity == Decimal("60000")
-        assert match.realized_pnl == Decimal("2000")  # (1.1500 - 1.1000) * 40k = 2000
-
-        # Queue should have reduced position
-        assert queue.get_net_position() == Decimal("60000")
-        assert len(queue.open_lots) == 1
-        assert queue.open_lots[0].quantity == Decimal("60000")
-
-    def test_multi_lot_fifo_match(self):
-        """Test FIFO match across multiple lots."""
+    def test_later_match_leaves_match_records(self):
+        """Test a later match leaves earlier match records untouched."""
         queue = LotQueue("EUR/USD")
+        queue.add_lot(make_lot(lot_id="T001", quantity=Q75K, original_quantity=Q75K))
+        (first,) = queue.match(Q50K, Side.SELL, PX_1_15, CLOSE_TIME)
 
-        # Add two BUY lots
-        lot1 = Lot(
-            lot_id="T001",
-            risk_pair="EUR/USD",
-            side=Side.BUY,
-            quantity=Decimal("50000"),
-            original_quantity=Decimal("50000"),
-            trade_price=Decimal("1.1000"),
-            open_timestamp=datetime(2024, 1, 1, 10, 0, tzinfo=timezone.utc),
-            originating_trade_id="T001",
-            decomposition_path="EUR/USD",
-            open_mid=Decimal("1.0995"),
-            close_timestamp=None,
-            close_mid=None,
-        )
-        lot2 = Lot(
-            lot_id="T002",
-            risk_pair="EUR/USD",
-            side=Side.BUY,
-            quantity=Decimal("75000"),
-            original_quantity=Decimal("75000"),
-            trade_price=Decimal("1.1100"),
-            open_timestamp=datetime(2024, 1, 1, 10, 5, tzinfo=timezone.utc),
-            originating_trade_id="T002",
-            decomposition_path="EUR/USD",
-            open_mid=Decimal("1.1095"),
-            close_timestamp=None,
-            close_mid=None,
-        )
-        queue.add_lot(lot1)
-        queue.add_lot(lot2)
-
-        # Match with SELL that spans both lots
-        matches = queue.match(
-            Decimal("100000"),
+        queue.match(
+            Decimal("10000"),
             Side.SELL,
-            Decimal("1.1500"),
-            datetime(2024, 1, 1, 11, 0, tzinfo=timezone.utc),
+            PX_1_15,
+            datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc),
         )
-
-        assert len(matches) == 2
-
-        # First match: lot1 fully closed
-        match1 = matches[0]
-        assert match1.matched_quantity == Decimal("50000")
-        assert match1.remaining_lot is None
-        assert match1.realized_pnl == Decimal("2500")  # (1.1500 - 1.1000) * 50k = 2500
-
-        # Second match: lot2 partially closed
-        match2 = matches[1]
-        assert match2.matched_quantity == Decimal("50000")
-        assert match2.remaining_lot is not None
-        assert match2.remaining_lot.quantity == Decimal("25000")
-        assert match2.realized_pnl == Decimal("2000")  # (1.1500 - 1.1100) * 50k = 2000
-
-        # Queue should have reduced position
-        assert queue.get_net_position() == Decimal("25000")
-        assert len(queue.open_lots) == 1
-        assert len(queue.closed_lots) == 1
+        assert first.lot.quantity == Q75K
+        assert first.remaining_lot.quantity == Decimal("25000")
+        assert queue.open_lots[0].quantity == Decimal("15000")
 
     def test_no_match_same_side(self):
         """Test no match occurs when sides are the same."""
         queue = LotQueue("EUR/USD")
-
-        buy_lot = Lot(
-            lot_id="T001",
-            risk_pair="EUR/USD",
-            side=Side.BUY,
-            quantity=Decimal("100000"),
-            original_quantity=Decimal("100000"),
-            trade_price=Decimal("1.1000"),
-            open_timestamp=datetime(2024, 1, 1, 10, 0, tzinfo=timezone.utc),
-            originating_trade_id="T001",
-            decomposition_path="EUR/USD",
-            open_mid=Decimal("1.0995"),
-            close_timestamp=None,
-            close_mid=None,
-        )
-        queue.add_lot(buy_lot)
+        queue.add_lot(make_lot(lot_id="T001"))
 
         # Try to match with BUY (same side)
         matches = queue.match(
-            Decimal("50000"),
+            Q50K,
             Side.BUY,
-            Decimal("1.1500"),
-            datetime(2024, 1, 1, 11, 0, tzinfo=timezone.utc),
+            PX_1_15,
+            CLOSE_TIME,
         )
 
         assert len(matches) == 0  # No matches
-        assert queue.get_net_position() == Decimal("100000")
-        assert len(queue.open_lots) == 1
+        assert_queue(queue, net="100000", open_count=1)
 
     def test_unrealized_pnl_calculation(self):
         """Test total unrealized P&L across multiple lots."""
         queue = LotQueue("EUR/USD")
-
-        # Add BUY lot
-        buy_lot = Lot(
-            lot_id="T001",
-            risk_pair="EUR/USD",
-            side=Side.BUY,
-            quantity=Decimal("100000"),
-            original_quantity=Decimal("100000"),
-            trade_price=Decimal("1.1000"),
-            open_timestamp=datetime(2024, 1, 1, 10, 0, tzinfo=timezone.utc),
-            originating_trade_id="T001",
-            decomposition_path="EUR/USD",
-            open_mid=Decimal("1.0995"),
-            close_timestamp=None,
-            close_mid=None,
-        )
-        # Add SELL lot
-        sell_lot = Lot(
-            lot_id="T002",
-            risk_pair="EUR/USD",
-            side=Side.SELL,
-            quantity=Decimal("50000"),
-            original_quantity=Decimal("50000"),
-            trade_price=Decimal("1.1200"),
-            open_timestamp=datetime(2024, 1, 1, 10, 5, tzinfo=timezone.utc),
-            originating_trade_id="T002",
-            decomposition_path="EUR/USD",
-            open_mid=Decimal("1.1205"),
-            close_timestamp=None,
-            close_mid=None,
+        queue.add_lot(make_lot(lot_id="T001"))
+        queue.add_lot(
+            make_lot(
+                lot_id="T002",
+                side=Side.SELL,
+                quantity=Q50K,
+                original_quantity=Q50K,
+                trade_price=Decimal("1.1200"),
+                originating_trade_id="T002",
+            )
         )
-        queue.add_lot(buy_lot)
-        queue.add_lot(sell_lot)
 
         # Mark @ 1.1500
         # BUY lot: (1.1500 - 1.1000) * 100k = +5000
         # SELL lot: (1.1200 - 1.1500) * 50k = -1500 (direction * -1)
         # Total: +3500
-        total_pnl = queue.get_total_unrealized_pnl(Decimal("1.1500"))
+        total_pnl = queue.get_total_unrealized_pnl(PX_1_15)
         assert total_pnl == Decimal("3500")
 
+    def test_mixed_side_queue_keeps_arrival_order(self):
+        """Test mixed-side queues list lots in arrival order and match one side."""
+        queue = LotQueue("EUR/USD")
+        for lot_id, side in [("B1", Side.BUY), ("S1", Side.SELL), ("B2", Side.BUY)]:
+            queue.add_lot(make_lot(lot_id=lot_id, side=side, originating_trade_id=lot_id))
+        assert [lot.lot_id for lot in queue.open_lots] == ["B1", "S1", "B2"]
+
+        # SELL matches only BUY lots: closes B1, reduces B2 in place
+        matches = queue.match(
+            Decimal("150000"),
+            Side.SELL,
+            PX_1_10,
+            CLOSE_TIME,
+        )
+        assert [m.lot.lot_id for m in matches] == ["B1", "B2"]
+        assert [lot.lot_id for lot in queue.open_lots] == ["S1", "B2"]
+        assert queue.open_lot_count == 2
+        assert queue.get_net_position() == Decimal("-50000")
+
+    def test_open_lots_is_the_queue_list(self):
+        """Test open_lots is a plain list attribute that matching updates in place."""
+        queue = LotQueue("EUR/USD")
+        open_lots = queue.open_lots
+        queue.add_lot(make_lot())
+        queue.match(Q100K, Side.SELL, PX_1_10, CLOSE_TIME)
+        assert queue.open_lots is open_lots
+        assert open_lots == [] and queue.open_lot_count == 0
+
 
 class TestLotConfig:
     """Test LotConfig validation."""
@@ -429,23 +380,10 @@ class TestLotManager:
         )
         manager = LotManager(config)
 
-        lot = Lot(
-            lot_id="T001",
-            risk_pair="EUR/USD",
-            side=Side.BUY,
-            quantity=Decimal("100000"),
-            original_quantity=Decimal("100000"),
-            trade_price=Decimal("1.1000"),
-            open_timestamp=datetime(2024, 1, 1, 10, 0, tzinfo=timezone.utc),
-            originating_trade_id="T001",
-            decomposition_path="EUR/USD",
-            open_mid=Decimal("1.0995"),
-            close_timestamp=None,
-            close_mid=None,
-        )
+        lot = make_lot(lot_id="T001")
         manager.add_lot(lot)
 
-        assert manager.get_net_position("EUR/USD") == Decimal("100000")
+        assert manager.get_net_position("EUR/USD") == Q100K
 
     def test_match_through_manager(self):
         """Test matching lots through manager."""
@@ -456,28 +394,15 @@ class TestLotManager:
         )
         manager = LotManager(config)
 
-        lot = Lot(
-            lot_id="T001",
-            risk_pair="EUR/USD",
-            side=Side.BUY,
-            quantity=Decimal("100000"),
-            original_quantity=Decimal("100000"),
-            trade_price=Decimal("1.1000"),
-            open_timestamp=datetime(2024, 1, 1, 10, 0, tzinfo=timezone.utc),
-            originating_trade_id="T001",
-            decomposition_path="EUR/USD",
-            open_mid=Decimal("1.0995"),
-            close_timestamp=None,
-            close_mid=None,
-        )
+        lot = make_lot(lot_id="T001")
         manager.add_lot(lot)
 
         matches = manager.match_lots(
             "EUR/USD",
-            Decimal("100000"),
+            Q100K,
             Side.SELL,
-            Decimal("1.1500"),
-            datetime(2024, 1, 1, 11, 0, tzinfo=timezone.utc),
+            PX_1_15,
+            CLOSE_TIME,
         )
 
         assert len(matches) == 1
@@ -494,41 +419,24 @@ class TestLotManager:
         manager = LotManager(config)
 
         # Add EUR/USD BUY lot
-        eur_lot = Lot(
-            lot_id="T001",
-            risk_pair="EUR/USD",
-            side=Side.BUY,
-            quantity=Decimal("100000"),
-            original_quantity=Decimal("100000"),
-            trade_price=Decimal("1.1000"),
-            open_timestamp=datetime(2024, 1, 1, 10, 0, tzinfo=timezone.utc),
-            originating_trade_id="T001",
-            decomposition_path="EUR/USD",
-            open_mid=Decimal("1.0995"),
-            close_timestamp=None,
-            close_mid=None,
-        )
+        eur_lot = make_lot(lot_id="T001")
         # Add GBP/USD SELL lot
-        gbp_lot = Lot(
+        gbp_lot = make_lot(
             lot_id="T002",
             risk_pair="GBP/USD",
             side=Side.SELL,
-            quantity=Decimal("50000"),
-            original_quantity=Decimal("50000"),
+            quantity=Q50K,
+            original_quantity=Q50K,
             trade_price=Decimal("1.3000"),
-            open_timestamp=datetime(2024, 1, 1, 10, 5, tzinfo=timezone.utc),
             originating_trade_id="T002",
             decomposition_path="GBP/USD",
-            open_mid=Decimal("1.3005"),
-            close_timestamp=None,
-            close_mid=None,
         )
         manager.add_lot(eur_lot)
         manager.add_lot(gbp_lot)
 
         # Mark EUR/USD @ 1.1500, GBP/USD @ 1.2800
         market_mids = {
-            "EUR/USD": Decimal("1.1500"),
+            "EUR/USD": PX_1_15,
             "GBP/USD": Decimal("1.2800"),
         }
         total_pnl = manager.compute_total_unrealized_pnl(market_mids)
@@ -539,48 +447,37 @@ class TestLotManager:
         assert total_pnl == Decimal("6000")
 
 
+@pytest.fixture(scope="module")
+def decomposer():
+    """USD decomposer over EUR/USD and GBP/USD rates; shared as it is only read."""
+    state = EngineState(
+        market_rates={
+            "EUR/USD": MarketRate(PX_1_0995, Decimal("1.1005"), PX_1_10),
+            "GBP/USD": MarketRate(Decimal("1.2936"), Decimal("1.2946"), PX_1_2941),
+        },
+    )
+    return TradeDecomposer(CurrencyConverter(state), "USD")
+
+
 class TestTradeDecomposer:
     """Test trade decomposition logic."""
 
-    def test_direct_pair_no_decomposition(self):
+    def test_direct_pair_no_decomposition(self, decomposer):
         """Test direct pair requires no decomposition."""
-        # Create state with EUR/USD rate
-        state = EngineState(
-            cash_balances={},
-            positions={},
-            market_rates={
-                "EUR/USD": MarketRate(Decimal("1.0995"), Decimal("1.1005"), Decimal("1.1000"))
-            },
-        )
-        converter = CurrencyConverter(state)
-        decomposer = TradeDecomposer(converter, "USD")
-
-        legs = decomposer.decompose("EUR/USD", Side.BUY, Decimal("100000"), Decimal("1.1000"))
+        legs = decomposer.decompose("EUR/USD", Side.BUY, Q100K, PX_1_10)
 
         assert len(legs) == 1
         leg = legs[0]
         assert leg.risk_pair == "EUR/USD"
         assert leg.side == Side.SELL  # Desk sells (opposite of client)
-        assert leg.quantity == Decimal("100000")
-        assert leg.trade_price == Decimal("1.1000")
+        assert leg.quantity == Q100K
+        assert leg.trade_price == PX_1_10
         assert leg.decomposition_path == "EUR/USD"
 
-    def test_cross_decomposition(self):
+    def test_cross_decomposition(self, decomposer):
         """Test cross trade decomposes into two legs."""
-        # Create state with EUR/USD and GBP/USD rates
-        state = EngineState(
-            cash_balances={},
-            positions={},
-            market_rates={
-                "EUR/USD": MarketRate(Decimal("1.0995"), Decimal("1.1005"), Decimal("1.1000")),
-                "GBP/USD": MarketRate(Decimal("1.2936"), Decimal("1.2946"), Decimal("1.2941")),
-            },
-        )
-        converter = CurrencyConverter(state)
-        decomposer = TradeDecomposer(converter, "USD")
-
         # Client BUY EUR/GBP 1M @ 0.8500
-        legs = decomposer.decompose("EUR/GBP", Side.BUY, Decimal("1000000"), Decimal("0.8500"))
+        legs = decomposer.decompose("EUR/GBP", Side.BUY, Q1M, PX_0_85)
 
         assert len(legs) == 2
 
@@ -588,8 +485,8 @@ class TestTradeDecomposer:
         leg1 = legs[0]
         assert leg1.risk_pair == "EUR/USD"
         assert leg1.side == Side.SELL
-        assert leg1.quantity == Decimal("1000000")
-        assert leg1.trade_price == Decimal("1.1000")
+        assert leg1.quantity == Q1M
+        assert leg1.trade_price == PX_1_10
         assert leg1.decomposition_path == "EUR/GBP->EUR/USD"
 
         # Leg 2: GBP/USD BUY (desk buys GBP)
@@ -597,25 +494,13 @@ class TestTradeDecomposer:
         assert leg2.risk_pair == "GBP/USD"
         assert leg2.side == Side.BUY
         assert leg2.quantity == Decimal("850000")  # 1M * 0.8500
-        assert leg2.trade_price == Decimal("1.2941")
+        assert leg2.trade_price == PX_1_2941
         assert leg2.decomposition_path == "EUR/GBP->GBP/USD"
 
-    def test_cross_sell_decomposition(self):
+    def test_cross_sell_decomposition(self, decomposer):
         """Test SELL cross trade decomposition."""
-        # Create state with EUR/USD and GBP/USD rates
-        state = EngineState(
-            cash_balances={},
-            positions={},
-            market_rates={
-                "EUR/USD": MarketRate(Decimal("1.0995"), Decimal("1.1005"), Decimal("1.1000")),
-                "GBP/USD": MarketRate(Decimal("1.2936"), Decimal("1.2946"), Decimal("1.2941")),
-            },
-        )
-        converter = CurrencyConverter(state)
-        decomposer = TradeDecomposer(converter, "USD")
-
         # Client SELL EUR/GBP 500k @ 0.8500
-        legs = decomposer.decompose("EUR/GBP", Side.SELL, Decimal("500000"), Decimal("0.8500"))
+        legs = decomposer.decompose("EUR/GBP", Side.SELL, Q500K, PX_0_85)
 
         assert len(legs) == 2
 
@@ -623,7 +508,7 @@ class TestTradeDecomposer:
         leg1 = legs[0]
         assert leg1.risk_pair == "EUR/USD"
         assert leg1.side == Side.BUY
-        assert leg1.quantity == Decimal("500000")
+        assert leg1.quantity == Q500K
 
         # Leg 2: GBP/USD SELL (desk sells GBP)
         leg2 = legs[1]
@@ -631,26 +516,15 @@ class TestTradeDecomposer:
         assert leg2.side == Side.SELL
         assert leg2.quantity == Decimal("425000")  # 500k * 0.8500
 
-    def test_legs_to_lots_conversion(self):
+    def test_legs_to_lots_conversion(self, decomposer):
         """Test converting legs to lot objects."""
-        # Create state with EUR/USD rate
-        state = EngineState(
-            cash_balances={},
-            positions={},
-            market_rates={
-                "EUR/USD": MarketRate(Decimal("1.0995"), Decimal("1.1005"), Decimal("1.1000"))
-            },
-        )
-        converter = CurrencyConverter(state)
-        decomposer = TradeDecomposer(converter, "USD")
-
-        legs = decomposer.decompose("EUR/USD", Side.BUY, Decimal("100000"), Decimal("1.1000"))
+        legs = decomposer.decompose("EUR/USD", Side.BUY, Q100K, PX_1_10)
 
-        open_mids = {"EUR/USD": Decimal("1.0995")}
+        open_mids = {"EUR/USD": PX_1_0995}
         lots = decomposer.legs_to_lots(
             legs,
             "T001",
-            datetime(2024, 1, 1, 10, 0, tzinfo=timezone.utc),
+            OPEN_TIME,
             open_mids,
         )
 
@@ -659,9 +533,26 @@ class TestTradeDecomposer:
         assert lot.lot_id == "T001_EUR/USD"
         assert lot.risk_pair == "EUR/USD"
         assert lot.side == Side.SELL
-        assert lot.quantity == Decimal("100000")
+        assert lot.quantity == Q100K
         assert lot.originating_trade_id == "T001"
-        assert lot.open_mid == Decimal("1.0995")
+        assert lot.open_mid == PX_1_0995
+        assert lot.original_quantity == Q100K
+        assert lot.decomposition_path == "EUR/USD"
+        assert lot.close_timestamp is None
+
+        remainder_lot = decomposer.leg_to_lot(
+            legs[0],
+            "T001",
+            OPEN_TIME,
+            PX_1_0995,
+            quantity=Q40K,
+        )
+        assert remainder_lot.lot_id == "T001_EUR/USD"
+        assert remainder_lot.quantity == Q40K
+        assert remainder_lot.original_quantity == Q40K
+
+        with pytest.raises(ValueError, match="Missing mid price for EUR/USD"):
+            decomposer.legs_to_lots(legs, "T002", OPEN_TIME, {})
 
 
 if __name__ == "__main__":
@@ -2,21 +2,65 @@
 Unit tests for event processor.
 """
 
+import logging
 from datetime import datetime, timezone
 from decimal import Decimal
 
 import pytest
 
 from efxlab.events import (
+    BaseEvent,
     ClientTradeEvent,
     ClockTickEvent,
     EventType,
     MarketUpdateEvent,
     Side,
 )
+from efxlab import processor as processor_module
 from efxlab.processor import EventProcessor
 from efxlab.state import EngineState
 
+TS = datetime(2025, 1, 1, 10, 0, 0, tzinfo=timezone.utc)
+# EUR/USD position after the default client BUY (desk sells 1M base)
+SHORT_1M = Decimal("-1000000")
+
+
+def make_quote(sequence_id, bid="1.0995", ask="1.1005", mid="1.1000", *, timestamp=TS):
+    """EUR/USD market update at TS unless overridden."""
+    return MarketUpdateEvent(
+        timestamp=timestamp,
+        sequence_id=sequence_id,
+        event_type=EventType.MARKET_UPDATE,
+        currency_pair="EUR/USD",
+        bid=Decimal(bid),
+        ask=Decimal(ask),
+        mid=Decimal(mid),
+    )
+
+
+def make_trade(
+    sequence_id,
+    side,
+    notional="1000000",
+    price="1.1000",
+    *,
+    client_id="CLIENT_001",
+    trade_id="TRADE_001",
+    timestamp=TS,
+):
+    """EUR/USD client trade at TS unless overridden."""
+    return ClientTradeEvent(
+        timestamp=timestamp,
+        sequence_id=sequence_id,
+        event_type=EventType.CLIENT_TRADE,
+        currency_pair="EUR/USD",
+        side=side,
+        notional=Decimal(notional),
+        price=Decimal(price),
+        client_id=client_id,
+        trade_id=trade_id,
+    )
+
 
 def test_processor_initialization():
     """Test processor initialization."""
@@ -34,15 +78,7 @@ def test_process_single_event():
     """Test processing a single event."""
     processor = EventProcessor()
 
-    event = MarketUpdateEvent(
-        timestamp=datetime(2025, 1, 1, 10, 0, 0, tzinfo=timezone.utc),
-        sequence_id=1,
-        event_type=EventType.MARKET_UPDATE,
-        currency_pair="EUR/USD",
-        bid=Decimal("1.0995"),
-        ask=Decimal("1.1005"),
-        mid=Decimal("1.1000"),
-    )
+    event = make_quote(1)
 
     processor.process_event(event)
 
@@ -51,31 +87,26 @@ def test_process_single_event():
     assert processor.state.get_market_rate("EUR/USD") is not None
 
 
+def test_unknown_event_type_rejected():
+    """Test events without a handler fail fast."""
+    processor = EventProcessor()
+    event = BaseEvent(
+        timestamp=TS,
+        sequence_id=1,
+        event_type=EventType.CLOCK_TICK,
+    )
+
+    with pytest.raises(ValueError, match="Unknown event type"):
+        processor.process_event(event)
+
+
 def test_process_multiple_events():
     """Test processing multiple events in sequence."""
     processor = EventProcessor()
 
     events = [
-        MarketUpdateEvent(
-            timestamp=datetime(2025, 1, 1, 10, 0, 0, tzinfo=timezone.utc),
-            sequence_id=1,
-            event_type=EventType.MARKET_UPDATE,
-            currency_pair="EUR/USD",
-            bid=Decimal("1.0995"),
-            ask=Decimal("1.1005"),
-            mid=Decimal("1.1000"),
-        ),
-        ClientTradeEvent(
-            timestamp=datetime(2025, 1, 1, 10, 0, 1, tzinfo=timezone.utc),
-            sequence_id=2,
-            event_type=EventType.CLIENT_TRADE,
-            currency_pair="EUR/USD",
-            side=Side.BUY,
-            notional=Decimal("1000000"),
-            price=Decimal("1.1000"),
-            client_id="CLIENT_001",
-            trade_id="TRADE_001",
-        ),
+        make_quote(1),
+        make_trade(2, Side.BUY, timestamp=datetime(2025, 1, 1, 10, 0, 1, tzinfo=timezone.utc)),
         ClockTickEvent(
             timestamp=datetime(2025, 1, 1, 11, 0, 0, tzinfo=timezone.utc),
             sequence_id=3,
@@ -88,7 +119,139 @@ def test_process_multiple_events():
 
     assert final_state.event_count == 3
     assert len(processor.output_records) == 3
-    assert final_state.get_position("EUR/USD") == Decimal("-1000000")
+    assert final_state.get_position("EUR/USD") == SHORT_1M
+
+
+def test_record_sink_flushes_in_chunks():
+    """Test output records are streamed to the sink in chunks."""
+    chunks = []
+    processor = EventProcessor(record_sink=chunks.append, flush_every=2)
+
+    events = [
+        ClockTickEvent(
+            timestamp=datetime(2025, 1, 1, 10 + i, 0, 0, tzinfo=timezone.utc),
+            sequence_id=i,
+            event_type=EventType.CLOCK_TICK,
+            tick_label=f"T+{i}H",
+        )
+        for i in range(5)
+    ]
+
+    processor.process_events(events)
+
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert [r.data["tick_label"] for chunk in chunks for r in chunk] == [
+        f"T+{i}H" for i in range(5)
+    ]
+    assert processor.output_records == []
+
+
+def test_record_queries_refuse_sink_mode():
+    """Test record queries raise rather than return a partial list when records go to a sink."""
+    processor = EventProcessor(record_sink=lambda records: None, flush_every=1)
+    processor.process_events([make_quote(1), make_quote(2)])
+
+    with pytest.raises(RuntimeError, match="record sink"):
+        processor.get_output_records()
+    with pytest.raises(RuntimeError, match="record sink"):
+        processor.get_output_records_by_type("market_update")
+
+
+def test_subclass_dispatch_is_cached_per_processor():
+    """Test event subclasses resolve to their base handler without touching the shared table."""
+
+    class TaggedQuote(MarketUpdateEvent):
+        pass
+
+    quote = make_quote(1)
+    tagged = TaggedQuote(
+        timestamp=TS,
+        sequence_id=2,
+        event_type=EventType.MARKET_UPDATE,
+        currency_pair="EUR/USD",
+        bid=quote.bid,
+        ask=quote.ask,
+        mid=quote.mid,
+    )
+    processor = EventProcessor()
+    processor.process_event(tagged)
+
+    assert processor.get_output_records()[0].record_type == "market_update"
+    assert TaggedQuote not in processor_module._HANDLERS
+    assert TaggedQuote not in EventProcessor()._handlers
+
+
+class RecordingLogger:
+    """Minimal logger stand-in that records debug events at a settable level."""
+
+    def __init__(self, level):
+        self.level = level
+        self.debug_events = []
+
+    def is_enabled_for(self, level):
+        return level >= self.level
+
+    def debug(self, event, **fields):
+        self.debug_events.append(event)
+
+    def info(self, event, **fields):
+        pass
+
+
+def test_debug_logging_enabled_after_construction(monkeypatch):
+    """Test per-event debug logging follows the level at the start of each run."""
+    recorder = RecordingLogger(logging.INFO)
+    monkeypatch.setattr(processor_module, "logger", recorder)
+    processor = EventProcessor()
+
+    processor.process_events([make_quote(1)])
+    assert recorder.debug_events == []
+
+    recorder.level = logging.DEBUG
+    processor.process_events([make_quote(2)])
+    assert recorder.debug_events == ["event_processed"]
+
+
+def test_output_records_by_type():
+    """Test records are looked up by type, including records emitted after a query."""
+    processor = EventProcessor()
+
+    def tick(i):
+        return ClockTickEvent(
+            timestamp=datetime(2025, 1, 1, 10 + i, 0, 0, tzinfo=timezone.utc),
+            sequence_id=i,
+            event_type=EventType.CLOCK_TICK,
+            tick_label=f"T+{i}H",
+        )
+
+    processor.process_event(tick(0))
+    assert len(processor.get_output_records_by_type("clock_tick")) == 1
+    assert processor.get_output_records_by_type("market_update") == []
+
+    processor.process_event(tick(1))
+    ticks = processor.get_output_records_by_type("clock_tick")
+    assert [r.data["tick_label"] for r in ticks] == ["T+0H", "T+1H"]
+
+    # A replaced record list (as after a flush) is indexed afresh
+    processor.output_records = []
+    assert processor.get_output_records_by_type("clock_tick") == []
+
+
+def test_snapshot_strings_are_per_processor():
+    """Test each processor renders snapshots through its own string cache."""
+    tick = ClockTickEvent(
+        timestamp=TS, sequence_id=2, event_type=EventType.CLOCK_TICK, tick_label="EOD"
+    )
+    processor1 = EventProcessor()
+    processor2 = EventProcessor()
+    assert processor1.snapshot_strings is not processor2.snapshot_strings
+
+    processor1.process_events([make_trade(1, Side.BUY), tick])
+    processor2.process_events([make_trade(1, Side.BUY), tick])
+    assert processor1.output_records == processor2.output_records
+    assert processor1.state.to_dict(strings=processor1.snapshot_strings) == (
+        processor2.state.to_dict()
+    )
 
 
 def test_deterministic_ordering():
@@ -98,28 +261,8 @@ def test_deterministic_ordering():
 
     # Create events with same timestamps but different sequence IDs
     events = [
-        ClientTradeEvent(
-            timestamp=datetime(2025, 1, 1, 10, 0, 0, tzinfo=timezone.utc),
-            sequence_id=2,
-            event_type=EventType.CLIENT_TRADE,
-            currency_pair="EUR/USD",
-            side=Side.BUY,
-            notional=Decimal("1000000"),
-            price=Decimal("1.1000"),
-            client_id="CLIENT_001",
-            trade_id="TRADE_002",
-        ),
-        ClientTradeEvent(
-            timestamp=datetime(2025, 1, 1, 10, 0, 0, tzinfo=timezone.utc),
-            sequence_id=1,
-            event_type=EventType.CLIENT_TRADE,
-            currency_pair="EUR/USD",
-            side=Side.SELL,
-            notional=Decimal("500000"),
-            price=Decimal("1.1000"),
-            client_id="CLIENT_002",
-            trade_id="TRADE_001",
-        ),
+        make_trade(2, Side.BUY, trade_id="TRADE_002"),
+        make_trade(1, Side.SELL, "500000", client_id="CLIENT_002"),
     ]
 
     # Process in different orders
@@ -136,17 +279,7 @@ def test_processor_state_isolation():
     initial_state = EngineState()
     processor = EventProcessor(initial_state)
 
-    event = ClientTradeEvent(
-        timestamp=datetime(2025, 1, 1, 10, 0, 0, tzinfo=timezone.utc),
-        sequence_id=1,
-        event_type=EventType.CLIENT_TRADE,
-        currency_pair="EUR/USD",
-        side=Side.BUY,
-        notional=Decimal("1000000"),
-        price=Decimal("1.1000"),
-        client_id="CLIENT_001",
-        trade_id="TRADE_001",
-    )
+    event = make_trade(1, Side.BUY)
 
     processor.process_event(event)
 
@@ -156,22 +289,14 @@ def test_processor_state_isolation():
 
     # Processor state should be updated
     assert processor.state.event_count == 1
-    assert processor.state.get_position("EUR/USD") == Decimal("-1000000")
+    assert processor.state.get_position("EUR/USD") == SHORT_1M
 
 
 def test_get_methods():
     """Test processor getter methods."""
     processor = EventProcessor()
 
-    event = MarketUpdateEvent(
-        timestamp=datetime(2025, 1, 1, 10, 0, 0, tzinfo=timezone.utc),
-        sequence_id=1,
-        event_type=EventType.MARKET_UPDATE,
-        currency_pair="EUR/USD",
-        bid=Decimal("1.0995"),
-        ask=Decimal("1.1005"),
-        mid=Decimal("1.1000"),
-    )
+    event = make_quote(1)
 
     processor.process_event(event)
 
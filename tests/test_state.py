@@ -2,12 +2,17 @@
 Unit tests for state model.
 """
 
+import copy
+import pickle
+import random
+import sys
+from datetime import datetime, timezone
 from decimal import Decimal
 
 import pytest
 
-from efxlab.events import Side
-from efxlab.state import EngineState, MarketRate, apply_trade
+from efxlab.events import ClientTradeEvent, EventType, Side
+from efxlab.state import DecimalStrCache, EngineState, MarketRate, apply_trade
 
 
 def test_initial_state():
@@ -19,6 +24,30 @@ def test_initial_state():
     assert len(state.positions) == 0
 
 
+def test_state_pickles_and_deep_copies():
+    """Default and populated states survive pickle and deepcopy."""
+    for state in (
+        EngineState(),
+        EngineState()
+        .update_cash("USD", Decimal("1000"))
+        .update_market_rate("EUR/USD", Decimal("1.0995"), Decimal("1.1005"), Decimal("1.1000")),
+    ):
+        for copied in (pickle.loads(pickle.dumps(state)), copy.deepcopy(state)):
+            assert copied == state
+            assert copied.rate_index == state.rate_index
+
+    assert "mappingproxy" not in repr(EngineState())
+
+
+def test_missing_balances_share_one_zero():
+    """Unknown currencies and pairs read back one module-level zero."""
+    state = EngineState()
+    zero = state.get_cash_balance("XXX")
+    assert zero == Decimal("0")
+    assert state.get_cash_balance("YYY") is zero
+    assert state.get_position("XXXYYY") is zero
+
+
 def test_cash_balance_operations():
     """Test cash balance updates."""
     state = EngineState()
@@ -41,6 +70,31 @@ def test_cash_balance_operations():
     assert state.get_cash_balance("USD") == Decimal("1300")
 
 
+def test_book_keys_are_interned():
+    """Keys are interned once, at event construction, and reach the books unchanged."""
+    event = ClientTradeEvent(
+        timestamp=datetime(2025, 1, 1, 10, 0, 0, tzinfo=timezone.utc),
+        sequence_id=1,
+        event_type=EventType.CLIENT_TRADE,
+        currency_pair="".join(["GBP/", "USD"]),
+        side=Side.BUY,
+        notional=Decimal("1"),
+        price=Decimal("1"),
+        client_id="CLIENT_001",
+        trade_id="TRADE_001",
+    )
+    traded = apply_trade(
+        EngineState(),
+        event.currency_pair,
+        event.side,
+        event.notional,
+        event.price,
+        currencies=(event.base_ccy, event.quote_ccy),
+    )
+    assert next(iter(traded.positions)) is sys.intern("GBP/USD")
+    assert set(map(id, traded.cash_balances)) == {id(sys.intern("GBP")), id(sys.intern("USD"))}
+
+
 def test_position_operations():
     """Test position updates."""
     state = EngineState()
@@ -77,6 +131,16 @@ def test_market_rate_operations():
     assert rate.mid == Decimal("1.1000")
 
 
+def test_market_rate_inverse_mid_is_cached():
+    """Inverse mid matches a fresh division and is computed once per rate."""
+    rate = MarketRate(bid=Decimal("149.9"), ask=Decimal("150.1"), mid=Decimal("150.0"))
+
+    inverse = rate.inverse_mid
+    assert inverse == Decimal("1") / Decimal("150.0")
+    assert rate.inverse_mid is inverse
+    assert rate == MarketRate(bid=Decimal("149.9"), ask=Decimal("150.1"), mid=Decimal("150.0"))
+
+
 def test_apply_trade_buy():
     """Test applying a BUY trade (client buys from desk)."""
     state = EngineState()
@@ -115,6 +179,66 @@ def test_apply_trade_sell():
     assert state.get_position("EUR/USD") == Decimal("1000000")
 
 
+def test_apply_trade_with_slippage_and_event_count():
+    """Test folding a quote cash adjustment and the event count into one update."""
+    timestamp = datetime(2025, 1, 1, 10, 0, 0, tzinfo=timezone.utc)
+    state = apply_trade(
+        EngineState(),
+        currency_pair="EUR/USD",
+        side=Side.SELL,
+        notional=Decimal("1000000"),
+        price=Decimal("1.1000"),
+        quote_cash_delta=Decimal("-250"),
+        timestamp=timestamp,
+    )
+
+    assert state.get_cash_balance("EUR") == Decimal("1000000")
+    assert state.get_cash_balance("USD") == Decimal("-1100250")
+    assert state.event_count == 1
+    assert state.last_timestamp == timestamp
+
+
+def test_market_and_config_updates_with_event_count():
+    """Test market and config updates can bump the event count in the same copy."""
+    timestamp = datetime(2025, 1, 1, 10, 0, 0, tzinfo=timezone.utc)
+    state = EngineState().update_market_rate(
+        "EUR/USD", Decimal("1.0999"), Decimal("1.1001"), Decimal("1.1000"), timestamp=timestamp
+    )
+    assert state.get_market_rate("EUR/USD").mid == Decimal("1.1000")
+    assert state.event_count == 1
+    assert state.last_timestamp == timestamp
+
+    state = state.update_config("reporting_currency", "EUR", timestamp=timestamp)
+    assert state.reporting_currency == "EUR"
+    assert state.event_count == 2
+
+    state = state.update_config("unknown_key", "x", timestamp=timestamp)
+    assert state.event_count == 3
+
+
+def test_state_batch_updates():
+    """Test batched updates produce one new state and leave the source untouched."""
+    timestamp = datetime(2025, 1, 1, 10, 0, 0, tzinfo=timezone.utc)
+    state = EngineState().update_cash("USD", Decimal("100"))
+
+    batch = state.batch()
+    batch.add_cash("USD", Decimal("-50")).add_cash("EUR", Decimal("40"))
+    batch.add_position("EUR/USD", Decimal("40")).count_event(timestamp)
+    new_state = batch.finalize()
+
+    assert new_state.get_cash_balance("USD") == Decimal("50")
+    assert new_state.get_cash_balance("EUR") == Decimal("40")
+    assert new_state.get_position("EUR/USD") == Decimal("40")
+    assert new_state.event_count == 1
+    assert state.get_cash_balance("USD") == Decimal("100")
+    assert state.positions == {}
+
+    # Further updates do not leak into the state already returned
+    batch.add_cash("USD", Decimal("1"))
+    assert new_state.get_cash_balance("USD") == Decimal("50")
+    assert batch.finalize().get_cash_balance("USD") == Decimal("51")
+
+
 def test_apply_multiple_trades():
     """Test multiple trades."""
     state = EngineState()
@@ -147,6 +271,44 @@ def test_apply_multiple_trades():
     expected_usd = Decimal("1100000") - Decimal("552500")
     assert state.get_cash_balance("USD") == expected_usd
 
+    # Folding the same trades into one batch gives the same books
+    batch = EngineState().batch()
+    batch.add_trade("EUR/USD", Side.BUY, Decimal("1000000"), Decimal("1.1000"))
+    batch.add_trade("EUR/USD", Side.SELL, Decimal("500000"), Decimal("1.1050"))
+    batched = batch.finalize()
+    assert batched.cash_balances == state.cash_balances
+    assert batched.positions == state.positions
+    assert [str(v) for v in batched.cash_balances.values()] == [
+        str(v) for v in state.cash_balances.values()
+    ]
+
+
+def test_batched_trade_stream_matches_sequential():
+    """A seeded stream of trades gives identical books batched or applied one by one."""
+    rng = random.Random(7)
+    pairs = ["EUR/USD", "GBP/USD", "USD/JPY", "EUR/GBP"]
+    trades = [
+        (
+            rng.choice(pairs),
+            rng.choice([Side.BUY, Side.SELL]),
+            Decimal(rng.randrange(1, 500)) * 1000,
+            Decimal(rng.randrange(50000, 160000)) / 10000,
+        )
+        for _ in range(1000)
+    ]
+
+    sequential = EngineState()
+    batch = EngineState().batch()
+    for pair, side, notional, price in trades:
+        sequential = apply_trade(sequential, pair, side, notional, price)
+        batch.add_trade(pair, side, notional, price)
+    batched = batch.finalize()
+
+    # Compare rendered values too, so differing exponents would show
+    for book in ("cash_balances", "positions"):
+        expected = {k: str(v) for k, v in getattr(sequential, book).items()}
+        assert {k: str(v) for k, v in getattr(batched, book).items()} == expected
+
 
 def test_compute_exposures():
     """Test exposure calculation."""
@@ -169,6 +331,27 @@ def test_compute_exposures():
     assert exposures["EUR"] == Decimal("1000000")
     assert exposures["USD"] == Decimal("-1100000")  # -1M * 1.1
 
+    # Memoized: callers get their own dict, carried over while positions/rates hold
+    exposures["EUR"] = Decimal("0")
+    later = state.increment_event_count(datetime(2025, 1, 1, tzinfo=timezone.utc))
+    assert later.compute_exposures()["EUR"] == Decimal("1000000")
+
+    # Moving positions or rates recomputes
+    assert later.update_position("EUR/USD", Decimal("-500000")).compute_exposures()[
+        "EUR"
+    ] == Decimal("500000")
+    moved = later.update_market_rate(
+        "EUR/USD", Decimal("1.1995"), Decimal("1.2005"), Decimal("1.2000")
+    )
+    assert moved.compute_exposures()["USD"] == Decimal("-1200000")
+
+    # A tick on a pair without a position keeps the memoized result
+    other = moved.update_market_rate(
+        "GBP/USD", Decimal("1.2699"), Decimal("1.2701"), Decimal("1.2700")
+    )
+    assert other.compute_exposures() == moved.compute_exposures()
+    assert other._exposures is moved._exposures
+
 
 def test_state_immutability():
     """Test that state updates return new instances."""
@@ -192,3 +375,37 @@ def test_state_serialization():
     assert data["cash_balances"]["USD"] == "1000"
     assert data["positions"]["EUR/USD"] == "500000"
     assert "exposures" in data
+
+    shallow = state.to_dict(include_exposures=False, include_rates=False)
+    assert "exposures" not in shallow
+    assert "market_rates" not in shallow
+    assert shallow["cash_balances"] == data["cash_balances"]
+
+
+def test_decimal_str_cache():
+    """Test snapshot string cache reuses unchanged values and tracks changes."""
+    cache = DecimalStrCache()
+    state = EngineState().update_cash("USD", Decimal("1000.50"))
+    state = state.update_cash("EUR", Decimal("20"))
+
+    first = cache.render("cash_balances", state.cash_balances)
+    assert first == {"USD": "1000.50", "EUR": "20"}
+
+    state = state.update_cash("EUR", Decimal("5"))
+    second = cache.render("cash_balances", state.cash_balances)
+
+    assert second == {"USD": "1000.50", "EUR": "25"}
+    assert second["USD"] is first["USD"]  # Unchanged balance reuses its string
+
+
+def test_event_count_timestamp_serialization():
+    """Test last event timestamp is kept as datetime and formatted on serialization."""
+    state = EngineState()
+    assert state.to_dict()["last_timestamp"] == ""
+
+    timestamp = datetime(2025, 1, 1, 10, 0, 0, tzinfo=timezone.utc)
+    state = state.increment_event_count(timestamp)
+
+    assert state.event_count == 1
+    assert state.last_timestamp == timestamp
+    assert state.to_dict()["last_timestamp"] == "2025-01-01T10:00:00+00:00"